@@ -1,10 +1,28 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session, send_file
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session, send_file, send_from_directory, Response, stream_with_context, g, has_request_context
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import generate_password_hash, check_password_hash, safe_join
+from werkzeug.http import is_resource_modified
 from datetime import datetime, date, timedelta
 import csv
 import io
+import json
+import base64
+import hashlib
+import threading
+import queue
+import time
+import uuid
+import zipfile
+import zlib
+import mimetypes
+import heapq
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from decimal import Decimal
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -13,7 +31,23 @@ from reportlab.lib.units import inch
 import os
 import pymysql
 from config import config
-from sqlalchemy.exc import IntegrityError, OperationalError
+from migrations import apply_migrations, migration_status
+from assets import VENDOR_ASSETS, build as build_assets, load_manifest
+from sqlalchemy import or_, and_, func, case, distinct, select, insert, update, delete, bindparam, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+from sqlalchemy.orm import joinedload, selectinload, contains_eager, make_transient_to_detached
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 
@@ -21,7 +55,133 @@ app = Flask(__name__)
 config_name = os.environ.get('FLASK_ENV', 'development')
 app.config.from_object(config[config_name])
 
+# JSON responses
+# Handlers hand Decimal, date and datetime values straight to jsonify. Money
+# is written as a number, which the bundled pages do arithmetic on; API
+# clients that need the exact digits ask for strings per request with
+# ?money_format=string. orjson does the encoding when installed, else the
+# stdlib.
+MONEY_FORMATS = ('number', 'string')
+
+class ShopJSONProvider(DefaultJSONProvider):
+    """JSON provider with native Decimal, date and datetime support"""
+    
+    sort_keys = False
+    
+    def money_format(self):
+        if has_request_context():
+            requested = request.args.get('money_format')
+            if requested in MONEY_FORMATS:
+                return requested
+        return 'number'
+    
+    def encoder_default(self):
+        money = str if self.money_format() == 'string' else float
+        
+        def default(value):
+            if isinstance(value, Decimal):
+                return money(value)
+            if isinstance(value, (date, datetime)):
+                return value.isoformat()
+            return DefaultJSONProvider.default(value)
+        return default
+    
+    def dumps(self, obj, **kwargs):
+        # response() only ever asks for indent=2 or compact separators, which
+        # orjson covers; anything else goes to the stdlib encoder
+        indent = kwargs.get('indent')
+        if orjson is None or set(kwargs) - {'indent', 'separators'} or indent not in (None, 2):
+            kwargs.setdefault('default', self.encoder_default())
+            kwargs.setdefault('sort_keys', self.sort_keys)
+            return super().dumps(obj, **kwargs)
+        
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.encoder_default(), option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+app.json = ShopJSONProvider(app)
+
+# Database connection pool
+class PoolMetrics:
+    """Counters for connection pool activity in this process"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections_created = 0
+        self.connections_invalidated = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+    
+    def record_wait(self, seconds, timed_out=False):
+        with self.lock:
+            self.checkouts += not timed_out
+            self.timeouts += timed_out
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+    
+    def count(self, name):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+    
+    def snapshot(self, pool):
+        """Live pool usage plus the counters collected so far"""
+        with self.lock:
+            waits = self.checkouts + self.timeouts
+            status = {
+                'connections_created': self.connections_created,
+                'connections_invalidated': self.connections_invalidated,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_seconds_total': round(self.wait_seconds_total, 6),
+                'wait_seconds_max': round(self.wait_seconds_max, 6),
+                'wait_ms_avg': round(self.wait_seconds_total / waits * 1000, 3) if waits else 0.0
+            }
+        status['pool_class'] = type(pool).__name__
+        # Queue pools report their usage; static and null pools have no queue
+        for name in ('size', 'checkedout', 'checkedin', 'overflow'):
+            method = getattr(pool, name, None)
+            status[name] = method() if callable(method) else None
+        status['max_overflow'] = getattr(pool, '_max_overflow', None)
+        status['timeout'] = pool.timeout() if callable(getattr(pool, 'timeout', None)) else None
+        status['recycle'] = pool._recycle
+        status['pre_ping'] = pool._pre_ping
+        return status
+
+pool_metrics = PoolMetrics()
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+# Pool sizing comes from the config class; queue pools get checkout timing
+engine_options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+if 'pool_size' in engine_options:
+    engine_options.setdefault('poolclass', MeteredQueuePool)
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+
 db = SQLAlchemy(app)
+
+db.event.listen(Pool, 'connect', lambda dbapi_connection, record: pool_metrics.count('connections_created'))
+db.event.listen(Pool, 'invalidate', lambda dbapi_connection, record, exception: pool_metrics.count('connections_invalidated'))
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
@@ -372,6 +532,29 @@ TRANSLATIONS = {
         'enter_phone_number': 'Enter phone number',
         'enter_complete_address': 'Enter complete address',
         'required': 'Required',
+        
+        # Bulk Invoices
+        'download_invoices': 'Download Invoices',
+        'select_date_range_for_invoices': 'Select a start and end date to download invoices.',
+        
+        # Report Aggregates
+        'group_by': 'Group By',
+        'daily': 'Daily',
+        'weekly': 'Weekly',
+        'monthly': 'Monthly',
+        'period': 'Period',
+        'show_order_lines': 'Show Order Lines',
+        'payment_status_breakdown': 'Payment Status Breakdown',
+        
+        # Pagination & Filters
+        'load_more': 'Load More',
+        'all_statuses': 'All Statuses',
+        'sort_by': 'Sort By',
+        'newest_first': 'Newest First',
+        'oldest_first': 'Oldest First',
+        'highest_amount': 'Highest Amount',
+        'latest_order_date': 'Latest Order Date',
+        'name_a_z': 'Name (A-Z)',
     },
     
     'hi': {
@@ -709,6 +892,29 @@ TRANSLATIONS = {
         'enter_phone_number': 'फोन नंबर दर्ज करें',
         'enter_complete_address': 'पूरा पता दर्ज करें',
         'required': 'आवश्यक',
+        
+        # Bulk Invoices
+        'download_invoices': 'चालान डाउनलोड करें',
+        'select_date_range_for_invoices': 'चालान डाउनलोड करने के लिए आरंभ और समाप्ति तिथि चुनें।',
+        
+        # Report Aggregates
+        'group_by': 'समूह बनाएं',
+        'daily': 'दैनिक',
+        'weekly': 'साप्ताहिक',
+        'monthly': 'मासिक',
+        'period': 'अवधि',
+        'show_order_lines': 'ऑर्डर लाइनें दिखाएं',
+        'payment_status_breakdown': 'भुगतान स्थिति विवरण',
+        
+        # Pagination & Filters
+        'load_more': 'और लोड करें',
+        'all_statuses': 'सभी स्थितियां',
+        'sort_by': 'क्रमबद्ध करें',
+        'newest_first': 'नवीनतम पहले',
+        'oldest_first': 'पुराने पहले',
+        'highest_amount': 'सबसे अधिक राशि',
+        'latest_order_date': 'नवीनतम ऑर्डर तिथि',
+        'name_a_z': 'नाम (अ-ज्ञ)',
     },
     
     'ur': {
@@ -1046,6 +1252,29 @@ TRANSLATIONS = {
         'enter_phone_number': 'فون نمبر درج کریں',
         'enter_complete_address': 'مکمل پتہ درج کریں',
         'required': 'مطلوبہ',
+        
+        # Bulk Invoices
+        'download_invoices': 'انوائسز ڈاؤن لوڈ کریں',
+        'select_date_range_for_invoices': 'انوائسز ڈاؤن لوڈ کرنے کے لیے شروع اور اختتامی تاریخ منتخب کریں۔',
+        
+        # Report Aggregates
+        'group_by': 'گروپ بندی',
+        'daily': 'روزانہ',
+        'weekly': 'ہفتہ وار',
+        'monthly': 'ماہانہ',
+        'period': 'مدت',
+        'show_order_lines': 'آرڈر لائنیں دکھائیں',
+        'payment_status_breakdown': 'ادائیگی کی حالت کی تفصیل',
+        
+        # Pagination & Filters
+        'load_more': 'مزید لوڈ کریں',
+        'all_statuses': 'تمام حالتیں',
+        'sort_by': 'ترتیب دیں',
+        'newest_first': 'نئے پہلے',
+        'oldest_first': 'پرانے پہلے',
+        'highest_amount': 'سب سے زیادہ رقم',
+        'latest_order_date': 'تازہ ترین آرڈر کی تاریخ',
+        'name_a_z': 'نام (ا-ی)',
     }
 }
 
@@ -1088,6 +1317,10 @@ class User(UserMixin, db.Model):
 
 class Customer(db.Model):
     __tablename__ = 'customers'
+    __table_args__ = (
+        db.Index('ix_customers_name', 'name', 'id'),
+        db.Index('ix_customers_updated_at', 'updated_at'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     phone = db.Column(db.String(20), nullable=False)
@@ -1100,6 +1333,10 @@ class Customer(db.Model):
 
 class Product(db.Model):
     __tablename__ = 'products'
+    __table_args__ = (
+        db.Index('ix_products_stock_quantity', 'stock_quantity'),
+        db.Index('ix_products_updated_at', 'updated_at'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     price = db.Column(db.Numeric(10, 2), nullable=False)
@@ -1113,6 +1350,13 @@ class Product(db.Model):
 
 class Order(db.Model):
     __tablename__ = 'orders'
+    __table_args__ = (
+        db.Index('ix_orders_customer_id', 'customer_id', 'order_date'),
+        db.Index('ix_orders_order_date', 'order_date', 'id'),
+        db.Index('ix_orders_delivery_date', 'delivery_date'),
+        db.Index('ix_orders_status_date', 'payment_status', 'order_date'),
+        db.Index('ix_orders_balance_due', 'balance_due', 'customer_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     customer_id = db.Column(db.Integer, db.ForeignKey('customers.id'), nullable=False)
     order_date = db.Column(db.Date, nullable=False)
@@ -1120,6 +1364,9 @@ class Order(db.Model):
     delivery_address = db.Column(db.Text)
     total_amount = db.Column(db.Numeric(10, 2), nullable=False, default=0.00)
     payment_status = db.Column(db.Enum('Paid', 'Unpaid', 'Partial'), default='Unpaid')
+    # Maintained from payments by the flush hooks under "Order balances"
+    paid_amount = db.Column(db.Numeric(10, 2), nullable=False, default=0.00)
+    balance_due = db.Column(db.Numeric(10, 2), nullable=False, default=0.00)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -1129,6 +1376,10 @@ class Order(db.Model):
 
 class OrderItem(db.Model):
     __tablename__ = 'order_items'
+    __table_args__ = (
+        db.Index('ix_order_items_order_id', 'order_id'),
+        db.Index('ix_order_items_product_id', 'product_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
     product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
@@ -1138,6 +1389,10 @@ class OrderItem(db.Model):
 
 class Payment(db.Model):
     __tablename__ = 'payments'
+    __table_args__ = (
+        db.Index('ix_payments_order_id', 'order_id'),
+        db.Index('ix_payments_payment_date', 'payment_date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
     payment_date = db.Column(db.Date, nullable=False)
@@ -1146,9 +1401,417 @@ class Payment(db.Model):
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class TableVersion(db.Model):
+    """Change counter of one table, bumped by every transaction that writes it"""
+    __tablename__ = 'table_versions'
+    table_name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+# User cache
+# Flask-Login loads the user on every authenticated request. Column values of
+# recently seen users are kept in memory for USER_CACHE_TTL_SECONDS and each
+# request gets its own detached User built from them, so the common case
+# needs no query. Updates and deletes through the ORM invalidate the entry.
+class UserCache:
+    """TTL cache of user column values keyed by id"""
+    
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                values = entry[1]
+            else:
+                self.misses += 1
+                values = None
+        
+        if values is None:
+            user = db.session.get(User, user_id)
+            if user is None:
+                return None
+            self.put(user)
+            return user
+        
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+    
+    def put(self, user):
+        values = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + app.config['USER_CACHE_TTL_SECONDS'], values)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > app.config['USER_CACHE_MAX_ENTRIES']:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+user_cache = UserCache()
+
+db.event.listen(User, 'after_update', lambda mapper, connection, target: user_cache.invalidate(target.id))
+db.event.listen(User, 'after_delete', lambda mapper, connection, target: user_cache.invalidate(target.id))
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return user_cache.get(int(user_id))
+
+# Query loaders
+# List endpoints build their result sets through these helpers so related rows
+# are fetched with a fixed number of queries instead of one lazy load per row.
+def order_list_query():
+    """Orders with customer and item products loaded up front"""
+    return Order.query.join(Order.customer).options(
+        contains_eager(Order.customer),
+        selectinload(Order.items).joinedload(OrderItem.product)
+    )
+
+def order_invoice_query():
+    """Orders with everything an invoice prints, payments included"""
+    return order_list_query().options(selectinload(Order.payments))
+
+def order_customer_query():
+    """Orders with their customer joined in"""
+    return Order.query.join(Order.customer).options(contains_eager(Order.customer))
+
+def payment_list_query():
+    """Payments with their order and customer joined in"""
+    return Payment.query.join(Payment.order).join(Order.customer).options(
+        contains_eager(Payment.order).contains_eager(Order.customer)
+    )
+
+def parse_date_arg(name):
+    """Read an optional YYYY-MM-DD request argument"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+def encode_cursor(*values):
+    """Pack the last row's sort value(s) and id into an opaque cursor"""
+    values = [
+        value.isoformat() if isinstance(value, (date, datetime))
+        else str(value) if isinstance(value, Decimal)
+        else value
+        for value in values
+    ]
+    raw = json.dumps(values).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_cursor(cursor, column):
+    """Unpack a cursor produced by encode_cursor for the given sort column"""
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        python_type = column.type.python_type
+        if value is not None:
+            if python_type is date:
+                value = date.fromisoformat(value)
+            elif python_type is datetime:
+                value = datetime.fromisoformat(value)
+            else:
+                value = python_type(value)
+        return value, int(row_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+def keyset_paginate(query, model, sort_columns, default_sort):
+    """Apply the sort, cursor and limit request arguments to a query.
+    
+    Pages are addressed by (sort value, id) of the last row seen rather than
+    an OFFSET, so fetching any page costs the same regardless of table size.
+    Returns the rows for this page and the cursor of the next one (or None).
+    """
+    sort = request.args.get('sort', default_sort)
+    descending = sort.startswith('-')
+    sort_key = sort.lstrip('-')
+    if sort_key not in sort_columns:
+        raise ValueError(f'Invalid sort key: {sort_key}')
+    
+    column = sort_columns[sort_key]
+    id_column = model.id
+    
+    limit = request.args.get('limit', app.config['ITEMS_PER_PAGE'], type=int)
+    limit = max(1, min(limit, app.config['MAX_ITEMS_PER_PAGE']))
+    
+    cursor = request.args.get('cursor')
+    if cursor:
+        value, last_id = decode_cursor(cursor, column)
+        if column is id_column:
+            query = query.filter(id_column < last_id if descending else id_column > last_id)
+        elif descending:
+            query = query.filter(or_(column < value, and_(column == value, id_column < last_id)))
+        else:
+            query = query.filter(or_(column > value, and_(column == value, id_column > last_id)))
+    
+    query = query.order_by(None)
+    if descending:
+        query = query.order_by(column.desc(), id_column.desc())
+    else:
+        query = query.order_by(column.asc(), id_column.asc())
+    
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, column.key), last.id)
+    
+    return rows, next_cursor
+
+def serialize_order(o):
+    """JSON representation of an order loaded through order_list_query"""
+    return {
+        'id': o.id,
+        'customer_id': o.customer_id,
+        'customer_name': o.customer.name,
+        'order_date': o.order_date,
+        'delivery_date': o.delivery_date,
+        'delivery_address': o.delivery_address,
+        'total_amount': o.total_amount,
+        'payment_status': o.payment_status,
+        'paid_amount': o.paid_amount,
+        'balance_due': o.balance_due,
+        'items': [{
+            'product_name': item.product.name,
+            'quantity': item.quantity,
+            'price': item.price
+        } for item in o.items]
+    }
+
+# Order balances
+# orders.paid_amount and orders.balance_due mirror the payments table. Every
+# flush that adds, changes or deletes a payment (or changes an order total)
+# applies the difference to the affected orders in the same transaction, so
+# outstanding queries filter on balance_due instead of summing payments.
+def owing_condition():
+    """Orders that still have money owed on them"""
+    return and_(Order.balance_due > 0, Order.payment_status != 'Paid')
+
+def payment_amount(value):
+    return Decimal(str(value)) if value is not None else Decimal('0')
+
+def balance_changes(session):
+    """Paid-amount deltas per order id for the objects about to be flushed"""
+    deltas = defaultdict(Decimal)
+    for obj in session.new:
+        if isinstance(obj, Payment):
+            deltas[obj.order_id] += payment_amount(obj.amount)
+        elif isinstance(obj, Order):
+            deltas[obj.id] += 0
+    for obj in session.deleted:
+        if isinstance(obj, Payment):
+            state = inspect(obj)
+            order_id = state.attrs.order_id.history.deleted or [obj.order_id]
+            amount = state.attrs.amount.history.deleted or [obj.amount]
+            deltas[order_id[0]] -= payment_amount(amount[0])
+    for obj in session.dirty:
+        state = inspect(obj)
+        if isinstance(obj, Payment) and obj not in session.deleted:
+            order_history = state.attrs.order_id.history
+            amount_history = state.attrs.amount.history
+            if order_history.has_changes() or amount_history.has_changes():
+                old_order = (order_history.deleted or [obj.order_id])[0]
+                old_amount = (amount_history.deleted or [obj.amount])[0]
+                deltas[old_order] -= payment_amount(old_amount)
+                deltas[obj.order_id] += payment_amount(obj.amount)
+        elif isinstance(obj, Order) and state.attrs.total_amount.history.has_changes():
+            deltas[obj.id] += 0
+    deltas.pop(None, None)
+    return deltas
+
+@db.event.listens_for(db.session, 'after_flush')
+def apply_balance_changes(session, flush_context):
+    deltas = balance_changes(session)
+    if not deltas:
+        return
+    orders = Order.__table__
+    delta = bindparam('delta', type_=orders.c.paid_amount.type)
+    # balance_due is assigned first: MySQL evaluates SET left to right, so it
+    # must see the old paid_amount just like every other database does
+    stmt = update(orders).where(orders.c.id == bindparam('order_ref')).ordered_values(
+        (orders.c.balance_due, orders.c.total_amount - orders.c.paid_amount - delta),
+        (orders.c.paid_amount, orders.c.paid_amount + delta)
+    )
+    session.connection().execute(stmt, [
+        {'order_ref': order_id, 'delta': amount} for order_id, amount in sorted(deltas.items())
+    ])
+    session.info.setdefault('stale_balances', set()).update(deltas)
+
+@db.event.listens_for(db.session, 'after_flush_postexec')
+def expire_balances(session, flush_context):
+    order_ids = session.info.pop('stale_balances', None)
+    if not order_ids:
+        return
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Order) and obj.id in order_ids:
+            session.expire(obj, ['paid_amount', 'balance_due'])
+
+def repair_order_balances():
+    """Recompute paid_amount and balance_due from payments for every order"""
+    orders = Order.__table__
+    # Rounded to cents on both sides: SQLite sums and subtracts in floating
+    # point, which would flag nearly every order as drifted
+    paid = func.round(select(func.coalesce(func.sum(Payment.amount), 0)).where(
+        Payment.order_id == orders.c.id
+    ).scalar_subquery(), 2)
+    balance = func.round(orders.c.total_amount - paid, 2)
+    chunk = app.config['BALANCE_REPAIR_CHUNK_SIZE']
+    last_id = db.session.query(func.max(Order.id)).scalar() or 0
+    repaired = 0
+    
+    # One transaction per id range keeps row locks short on large tables
+    for start in range(0, last_id, chunk):
+        result = db.session.execute(
+            update(orders).where(
+                orders.c.id > start, orders.c.id <= start + chunk,
+                or_(func.round(orders.c.paid_amount, 2) != paid, func.round(orders.c.balance_due, 2) != balance)
+            ).values(paid_amount=paid, balance_due=balance)
+        )
+        db.session.commit()
+        repaired += result.rowcount
+    
+    db.session.expire_all()
+    return repaired
+
+def dashboard_summary():
+    """Dashboard figures computed with two aggregate queries"""
+    today = date.today()
+    first_day = today.replace(day=1)
+    
+    # Each figure is a scalar subquery with its own indexed filter
+    totals = db.session.query(
+        db.session.query(func.count(Customer.id)).scalar_subquery(),
+        db.session.query(func.count(Product.id)).scalar_subquery(),
+        db.session.query(func.coalesce(func.sum(Order.total_amount), 0)).filter(
+            Order.order_date >= first_day).scalar_subquery(),
+        db.session.query(func.coalesce(func.sum(Order.balance_due), 0)).filter(
+            owing_condition()).scalar_subquery(),
+        db.session.query(func.count(Order.id)).filter(Order.order_date == today).scalar_subquery()
+    ).one()
+    
+    low_stock_products = Product.query.filter(Product.stock_quantity < 10).order_by(Product.stock_quantity).all()
+    
+    return {
+        'total_customers': totals[0],
+        'total_products': totals[1],
+        'monthly_sales': totals[2],
+        'pending_amount': totals[3],
+        'orders_placed_today': totals[4],
+        'low_stock_products': [{
+            'id': p.id,
+            'name': p.name,
+            'stock_quantity': p.stock_quantity,
+            'unit': p.unit
+        } for p in low_stock_products]
+    }
+
+def report_date_range():
+    """Read start_date/end_date from the request, defaulting to the current month"""
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    
+    if start_date and end_date:
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end = datetime.strptime(end_date, '%Y-%m-%d').date()
+        return start, end
+    
+    return date.today().replace(day=1), None
+
+def report_range_condition(start, end=None):
+    """Order date filter for a report range from report_date_range"""
+    if end is not None:
+        return Order.order_date.between(start, end)
+    return Order.order_date >= start
+
+def report_period_expression(period):
+    """Order date truncated to a day, ISO week or month label in SQL"""
+    formats = {
+        'day': ('%Y-%m-%d', '%Y-%m-%d'),
+        'week': ('%x-W%v', None),
+        'month': ('%Y-%m', '%Y-%m')
+    }
+    if period not in formats:
+        raise ValueError(f'Invalid period: {period}')
+    
+    mysql_format, sqlite_format = formats[period]
+    if db.engine.dialect.name == 'mysql':
+        return func.date_format(Order.order_date, mysql_format)
+    if sqlite_format is None:
+        # SQLite before 3.46 has no %G/%V, so the ISO week is read off the
+        # Thursday of the order's Monday-to-Sunday week, which always falls
+        # in the ISO year the week belongs to
+        thursday = func.date(Order.order_date, '-3 days', 'weekday 4')
+        day_of_year = db.cast(func.strftime('%j', thursday), db.Integer)
+        week = (day_of_year + 6) // 7
+        return func.strftime('%Y', thursday).concat('-W').concat(func.printf('%02d', week))
+    return func.strftime(sqlite_format, Order.order_date)
+
+def sales_lines_query(start, end=None, after=None):
+    """Flat order-line projection used by the sales report and CSV export.
+    
+    Lines come out in (order date, order id, line id) order, so the range is
+    read from ix_orders_order_date and each order's lines through
+    ix_order_items_order_id; the work grows with the date range rather than
+    with the size of order_items. ``after`` is the (order date, order id,
+    line id) of the last line already seen, for keyset pagination.
+    """
+    query = db.session.query(
+        OrderItem.id,
+        Order.id.label('order_id'),
+        Order.order_date,
+        Customer.name.label('customer_name'),
+        Product.name.label('product_name'),
+        OrderItem.quantity,
+        OrderItem.price,
+        Order.payment_status
+    ).select_from(Order).join(
+        OrderItem, OrderItem.order_id == Order.id
+    ).join(
+        Customer, Order.customer_id == Customer.id
+    ).join(
+        Product, OrderItem.product_id == Product.id
+    ).filter(report_range_condition(start, end))
+    
+    if after is not None:
+        last_date, last_order_id, last_line_id = after
+        # The plain >= keeps the index range tight; the OR skips what was seen
+        query = query.filter(Order.order_date >= last_date, or_(
+            Order.order_date > last_date,
+            Order.id > last_order_id,
+            and_(Order.id == last_order_id, OrderItem.id > last_line_id)
+        ))
+    
+    return query.order_by(Order.order_date, Order.id, OrderItem.id)
+
+def decode_sales_cursor(cursor):
+    """Unpack a sales report cursor into (order date, order id, line id)"""
+    try:
+        order_date, order_id, line_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return date.fromisoformat(order_date), int(order_id), int(line_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
 
 def create_database_if_not_exists():
     """Create the database if it doesn't exist"""
@@ -1271,41 +1934,427 @@ def insert_sample_data():
         print(f"Error inserting sample data: {e}")
         db.session.rollback()
 
+# Conditional GET
+# Rarely changing lists are served with an ETag built from per-table change
+# counters, so a revalidating client gets a 304 after one primary key read
+# instead of the view's queries. The counters live in the table_versions
+# table: every transaction that runs an INSERT/UPDATE/DELETE against a
+# tracked table, whether from an ORM flush or a Core statement, bumps them
+# just before it commits, so every worker sees the new version together with
+# the write. No Last-Modified is sent; it only resolves to the second, and a
+# write in the same second would leave If-Modified-Since answering 304.
+VERSIONED_TABLES = ['customers', 'products', 'orders', 'order_items', 'payments']
+
+@db.event.listens_for(TableVersion.__table__, 'after_create')
+def seed_table_versions(target, connection, **kw):
+    connection.execute(target.insert(), [
+        {'table_name': table, 'version': 0, 'changed_at': datetime.utcnow()} for table in VERSIONED_TABLES
+    ])
+
+class TableVersions:
+    """Reads and bumps the table_versions counters of a set of tables"""
+    
+    def __init__(self, tables):
+        self.tables = set(tables)
+        self.local = threading.local()
+        self.listeners = []
+    
+    def note_write(self, connection, table):
+        if table in self.tables:
+            connection.info.setdefault('changed_tables', set()).add(table)
+    
+    def committing(self, connection):
+        # Runs inside the transaction being committed, so the new version
+        # becomes visible at the same moment as the writes it stands for
+        tables = connection.info.pop('changed_tables', None)
+        if tables:
+            versions = TableVersion.__table__
+            connection.execute(
+                update(versions).where(versions.c.table_name.in_(sorted(tables))).values(
+                    version=versions.c.version + 1, changed_at=datetime.utcnow()
+                )
+            )
+            self.local.committed = (getattr(self.local, 'committed', None) or set()) | tables
+    
+    def committed(self):
+        tables = getattr(self.local, 'committed', None)
+        self.local.committed = None
+        if tables:
+            for listener in self.listeners:
+                listener(tables)
+    
+    def on_commit(self, listener):
+        """Call listener(tables) after each session commit in this process that changed them"""
+        self.listeners.append(listener)
+    
+    def discard(self, connection):
+        connection.info.pop('changed_tables', None)
+    
+    def current(self, tables):
+        """(version, changed_at) per table as committed in the database"""
+        versions = TableVersion.__table__
+        rows = db.session.execute(
+            select(versions.c.table_name, versions.c.version, versions.c.changed_at)
+            .where(versions.c.table_name.in_(list(tables)))
+        ).all()
+        return {row[0]: (row[1], row[2]) for row in rows}
+    
+    def etag(self, tables, variant=''):
+        """Strong ETag for a representation built from these tables"""
+        current = self.current(tables)
+        # changed_at tells a recreated database's counters from the old ones
+        state = '.'.join(f'{version}@{changed_at}' for version, changed_at in
+                         (current.get(table, (0, None)) for table in tables))
+        return hashlib.sha1(f'{state}:{variant}'.encode('utf-8')).hexdigest()[:16]
+
+table_versions = TableVersions(VERSIONED_TABLES)
+
+@db.event.listens_for(Engine, 'after_execute')
+def note_table_write(connection, statement, multiparams, params, execution_options, result):
+    if getattr(statement, 'is_dml', False):
+        table_versions.note_write(connection, getattr(statement.table, 'name', None))
+
+@db.event.listens_for(Engine, 'commit')
+def bump_table_versions(connection):
+    table_versions.committing(connection)
+
+@db.event.listens_for(Engine, 'rollback')
+def discard_table_versions(connection):
+    table_versions.discard(connection)
+
+@db.event.listens_for(db.session, 'after_commit')
+def confirm_table_versions(session):
+    table_versions.committed()
+
+def versioned(*tables):
+    """Answer GETs conditionally using the change counters of the given tables"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+            
+            etag = table_versions.etag(tables, request.full_path)
+            if not is_resource_modified(request.environ, etag=etag):
+                response = Response(status=304)
+            else:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+# Request metrics
+# Latency, response size and SQL usage per endpoint, plus invoice render times
+# and pool usage, exposed on /metrics in the Prometheus text format. The
+# request and cursor hooks are only installed when METRICS_ENABLED is set, so
+# a disabled build pays nothing beyond one flag check per invoice render.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values"""
+    
+    def __init__(self, name, help_text, labels, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self.series = {}
+    
+    def observe(self, label_values, value):
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = [0] * len(self.buckets) + [0, 0.0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += 1
+        series[-1] += value
+    
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for label_values, series in sorted(self.series.items()):
+            labels = format_labels(self.labels, label_values)
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{labels}{"," if labels else ""}le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{labels}{"," if labels else ""}le="+Inf"}} {series[-2]}')
+            lines.append(f'{self.name}_count{{{labels}}} {series[-2]}')
+            lines.append(f'{self.name}_sum{{{labels}}} {series[-1]:.6f}')
+        return lines
+
+class CounterMetric:
+    """Monotonic counter keyed by label values"""
+    
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.series = defaultdict(float)
+    
+    def inc(self, label_values, amount=1):
+        self.series[label_values] += amount
+    
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for label_values, value in sorted(self.series.items()):
+            lines.append(f'{self.name}{{{format_labels(self.labels, label_values)}}} {value:g}')
+        return lines
+
+def format_labels(names, values):
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in values)
+    return ','.join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+class RequestMetrics:
+    """All metrics for this process, guarded by one lock"""
+    
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.request_seconds = Histogram('shop_http_request_duration_seconds', 'Time from request start to response completion',
+                                         ('endpoint', 'method', 'status'), LATENCY_BUCKETS)
+        self.response_bytes = Histogram('shop_http_response_size_bytes', 'Response body size where the length is known',
+                                        ('endpoint',), SIZE_BUCKETS)
+        self.request_statements = Histogram('shop_db_statements_per_request', 'SQL statements issued per request',
+                                            ('endpoint',), STATEMENT_BUCKETS)
+        self.statements = CounterMetric('shop_db_statements_total', 'SQL statements executed', ('endpoint',))
+        self.statement_seconds = CounterMetric('shop_db_statement_seconds_total', 'Time spent executing SQL statements', ('endpoint',))
+        self.invoice_seconds = Histogram('shop_invoice_render_seconds', 'Invoice PDF render time',
+                                         ('mode',), LATENCY_BUCKETS)
+    
+    def observe_request(self, endpoint, method, status, seconds, size, statements, statement_seconds):
+        with self.lock:
+            self.request_seconds.observe((endpoint, method, str(status)), seconds)
+            if size is not None:
+                self.response_bytes.observe((endpoint,), size)
+            self.request_statements.observe((endpoint,), statements)
+            self.statements.inc((endpoint,), statements)
+            self.statement_seconds.inc((endpoint,), statement_seconds)
+    
+    def observe_statement(self, seconds):
+        # Statements outside a request (notifier, startup) are counted as background
+        if has_request_context() and 'metrics_started' in g:
+            g.metrics_statements += 1
+            g.metrics_statement_seconds += seconds
+        else:
+            with self.lock:
+                self.statements.inc(('background',))
+                self.statement_seconds.inc(('background',), seconds)
+    
+    def observe_invoice(self, mode, seconds):
+        if self.enabled:
+            with self.lock:
+                self.invoice_seconds.observe((mode,), seconds)
+    
+    def render(self):
+        with self.lock:
+            lines = []
+            for metric in (self.request_seconds, self.response_bytes, self.request_statements,
+                           self.statements, self.statement_seconds, self.invoice_seconds):
+                lines.extend(metric.render())
+        
+        pool = pool_metrics.snapshot(db.engine.pool)
+        gauges = [
+            ('shop_db_pool_checked_out', 'gauge', 'Connections currently checked out', pool['checkedout']),
+            ('shop_db_pool_size', 'gauge', 'Configured pool size', pool['size']),
+            ('shop_db_pool_overflow', 'gauge', 'Connections open beyond pool_size', pool['overflow']),
+            ('shop_db_pool_connections_created_total', 'counter', 'Connections opened', pool['connections_created']),
+            ('shop_db_pool_checkouts_total', 'counter', 'Successful connection checkouts', pool['checkouts']),
+            ('shop_db_pool_timeouts_total', 'counter', 'Checkouts that timed out', pool['timeouts']),
+            ('shop_db_pool_wait_seconds_total', 'counter', 'Time spent waiting for a connection', pool['wait_seconds_total'])
+        ]
+        users = user_cache.stats()
+        gauges += [
+            ('shop_user_cache_hits_total', 'counter', 'Logged-in user lookups served from the cache', users['hits']),
+            ('shop_user_cache_misses_total', 'counter', 'Logged-in user lookups that queried the database', users['misses']),
+            ('shop_user_cache_entries', 'gauge', 'Users currently cached', users['entries']),
+            ('shop_user_cache_hit_ratio', 'gauge', 'Share of user lookups served from the cache', users['hit_rate'])
+        ]
+        for name, kind, help_text, value in gauges:
+            if value is not None:
+                lines.extend([f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {value}'])
+        return '\n'.join(lines) + '\n'
+
+request_metrics = RequestMetrics()
+
+def start_request_timer():
+    g.metrics_started = time.perf_counter()
+    g.metrics_statements = 0
+    g.metrics_statement_seconds = 0.0
+
+def note_response(response):
+    g.metrics_status = response.status_code
+    # Streamed bodies (SSE, CSV export) have no length up front and are left out
+    g.metrics_size = response.content_length
+    return response
+
+def record_request(exception):
+    if 'metrics_started' not in g:
+        return
+    request_metrics.observe_request(
+        request.endpoint or 'unmatched',
+        request.method,
+        g.get('metrics_status', 500),
+        time.perf_counter() - g.metrics_started,
+        g.get('metrics_size'),
+        g.metrics_statements,
+        g.metrics_statement_seconds
+    )
+
+def start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_statement_started', []).append(time.perf_counter())
+
+def record_statement(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['metrics_statement_started'].pop()
+    request_metrics.observe_statement(time.perf_counter() - started)
+
+def discard_statement_timer(context):
+    # Failed statements never reach after_cursor_execute
+    started = context.connection.info.get('metrics_statement_started')
+    if started:
+        started.pop()
+
+if app.config['METRICS_ENABLED']:
+    request_metrics.enabled = True
+    app.before_request(start_request_timer)
+    app.after_request(note_response)
+    app.teardown_request(record_request)
+    db.event.listen(Engine, 'before_cursor_execute', start_statement_timer)
+    db.event.listen(Engine, 'after_cursor_execute', record_statement)
+    db.event.listen(Engine, 'handle_error', discard_statement_timer)
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint"""
+    if not request_metrics.enabled:
+        return jsonify({'error': 'Metrics are disabled (set METRICS_ENABLED)'}), 404
+    token = app.config['METRICS_TOKEN']
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return jsonify({'error': 'Unauthorized'}), 401
+    return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# Response compression
+# JSON, HTML and CSV responses are gzip (or brotli) encoded when the client
+# accepts it. Buffered bodies under COMPRESS_MIN_SIZE are left alone; streamed
+# bodies (the CSV export) are compressed chunk by chunk with a sync flush, so
+# each chunk still reaches the client as soon as it is produced. Server-sent
+# events and files that are already encoded (/assets/) pass through untouched.
+def response_compressor(encoding):
+    """Return (compress, flush, finish) callables for one response body"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=app.config['COMPRESS_BROTLI_QUALITY'])
+        return compressor.process, compressor.flush, compressor.finish
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(app.config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+def compressed_stream(chunks, encoding):
+    compress, flush, finish = response_compressor(encoding)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compress(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+def compress_response(response):
+    if (response.status_code < 200 or response.status_code in (204, 304)
+            or response.mimetype not in app.config['COMPRESS_MIMETYPES']
+            or 'Content-Encoding' in response.headers or response.direct_passthrough):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    if brotli is not None and request.accept_encodings['br']:
+        encoding = 'br'
+    elif request.accept_encodings['gzip']:
+        encoding = 'gzip'
+    else:
+        return response
+    
+    if response.is_streamed:
+        response.response = compressed_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+        compress, _, finish = response_compressor(encoding)
+        response.set_data(compress(data) + finish())
+    response.headers['Content-Encoding'] = encoding
+    
+    # The encoded body differs byte for byte, so a strong validator becomes
+    # weak; If-None-Match uses weak comparison, so 304s keep working
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+if app.config['COMPRESS_ENABLED']:
+    app.after_request(compress_response)
+
+# Static assets
+# Templates link stylesheets and scripts through asset_url(). After a build
+# (python assets.py, or starting app.py) it returns the content-hashed copy
+# under /assets/, which is served with a one-year immutable Cache-Control and
+# as a precompressed .br or .gz file when the browser accepts one, so repeat
+# page loads only fetch the HTML. Vendor libraries that have not been
+# downloaded into static/vendor/ fall back to their CDN URLs.
+ASSET_MAX_AGE = 365 * 24 * 3600
+asset_manifest = load_manifest()
+
+def asset_url(path):
+    """URL for a file under static/, preferring its fingerprinted build"""
+    # In debug mode pick up rebuilds without a restart
+    manifest = load_manifest() if app.debug else asset_manifest
+    if path in manifest:
+        return url_for('built_asset', filename=manifest[path])
+    if path in VENDOR_ASSETS and not os.path.exists(os.path.join(app.static_folder, path)):
+        return VENDOR_ASSETS[path]
+    return url_for('static', filename=path)
+
+app.jinja_env.globals.update(asset_url=asset_url)
+
+@app.route('/assets/<path:filename>')
+def built_asset(filename):
+    """Serve a fingerprinted asset, precompressed if the client accepts it"""
+    directory = os.path.join(app.static_folder, 'dist')
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        path = safe_join(directory, filename + suffix)
+        if request.accept_encodings[encoding] and path and os.path.isfile(path):
+            response = send_from_directory(directory, filename + suffix, max_age=ASSET_MAX_AGE,
+                                           mimetype=mimetypes.guess_type(filename)[0])
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(directory, filename, max_age=ASSET_MAX_AGE)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
 # Routes
 @app.route('/')
 @login_required
 def dashboard():
-    # Get dashboard statistics
-    total_customers = Customer.query.count()
-    total_products = Product.query.count()
-    
-    # Calculate monthly sales
-    first_day = date.today().replace(day=1)
-    monthly_orders = Order.query.filter(Order.order_date >= first_day).all()
-    monthly_sales = sum(order.total_amount for order in monthly_orders)
-    
-    # Get pending payments (outstanding amounts)
-    pending_orders = Order.query.filter(Order.payment_status != 'Paid').all()
-    pending_amount = 0
-    for order in pending_orders:
-        total_paid = sum(float(p.amount) for p in order.payments)
-        outstanding = float(order.total_amount) - total_paid
-        pending_amount += outstanding
-    
-    # Get orders placed today
-    today = date.today()
-    orders_placed_today = Order.query.filter(Order.order_date == today).count()
-    
-    # Get low stock products
-    low_stock_products = Product.query.filter(Product.stock_quantity < 10).all()
-    
-    return render_template('dashboard.html', 
-                         total_customers=total_customers,
-                         total_products=total_products,
-                         monthly_sales=monthly_sales,
-                         pending_amount=pending_amount,
-                         orders_placed_today=orders_placed_today,
-                         low_stock_products=low_stock_products)
+    # Figures are loaded asynchronously from /api/dashboard/summary
+    return render_template('dashboard.html')
+
+@app.route('/api/dashboard/summary')
+@login_required
+def api_dashboard_summary():
+    return jsonify(dashboard_summary())
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -1316,6 +2365,7 @@ def login():
         user = User.query.filter_by(username=username).first()
         if user and check_password_hash(user.password_hash, password):
             login_user(user)
+            user_cache.put(user)
             return redirect(url_for('dashboard'))
         else:
             flash('Invalid username or password', 'error')
@@ -1332,11 +2382,16 @@ def logout():
 @app.route('/customers')
 @login_required
 def customers():
-    customers = Customer.query.all()
-    return render_template('customers.html', customers=customers)
+    # Render the first page; further pages and searches go through /api/customers
+    customers, next_cursor = keyset_paginate(Customer.query, Customer, {'id': Customer.id}, 'id')
+    return render_template('customers.html',
+                         customers=customers,
+                         next_cursor=next_cursor,
+                         customer_count=Customer.query.count())
 
 @app.route('/api/customers', methods=['GET', 'POST'])
 @login_required
+@versioned('customers')
 def api_customers():
     if request.method == 'POST':
         data = request.get_json()
@@ -1362,13 +2417,33 @@ def api_customers():
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
     
-    customers = Customer.query.all()
-    return jsonify([{
-        'id': c.id,
-        'name': c.name,
-        'phone': c.phone,
-        'address': c.address
-    } for c in customers])
+    try:
+        query = Customer.query
+        
+        q = request.args.get('q', '').strip()
+        if q:
+            query = query.filter(or_(
+                Customer.name.ilike(f'%{q}%'),
+                Customer.phone.ilike(f'%{q}%'),
+                Customer.address.ilike(f'%{q}%')
+            ))
+        
+        customers, next_cursor = keyset_paginate(query, Customer, {
+            'id': Customer.id,
+            'name': Customer.name
+        }, 'id')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'items': [{
+            'id': c.id,
+            'name': c.name,
+            'phone': c.phone,
+            'address': c.address
+        } for c in customers],
+        'next_cursor': next_cursor
+    })
 
 @app.route('/api/customers/<int:customer_id>/check-orders')
 @login_required
@@ -1380,6 +2455,139 @@ def check_customer_orders(customer_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Cascade deletes
+# A customer's orders (with their payments and items) and a product's order
+# items are removed with set-based DELETEs in child-to-parent order, one
+# chunk of CASCADE_DELETE_CHUNK_SIZE parents per transaction, so locks are
+# held briefly however long the history is. If a chunk fails, the chunks
+# already committed stay deleted and repeating the delete finishes the job.
+# With ?background=1 the work runs in a thread and the response carries a
+# job id for GET /api/delete-jobs/<job_id>. Jobs live in this process only.
+delete_jobs = {}
+delete_jobs_lock = threading.Lock()
+
+def delete_orders(order_ids):
+    """Delete orders with their payments and items, children first"""
+    counts = {}
+    for key, statement in (
+        ('payments', delete(Payment).where(Payment.order_id.in_(order_ids))),
+        ('order_items', delete(OrderItem).where(OrderItem.order_id.in_(order_ids))),
+        ('orders', delete(Order).where(Order.id.in_(order_ids)))
+    ):
+        result = db.session.execute(statement, execution_options={'synchronize_session': False})
+        counts[key] = result.rowcount
+    # Core deletes skip the ORM after_delete hook that drops cached invoices
+    invoice_cache.invalidate_many(order_ids)
+    return counts
+
+def delete_customer(customer_id, job=None):
+    """Delete a customer and their whole order history in chunks"""
+    chunk_size = app.config['CASCADE_DELETE_CHUNK_SIZE']
+    totals = Counter()
+    while True:
+        order_ids = db.session.scalars(
+            select(Order.id).where(Order.customer_id == customer_id).order_by(Order.id).limit(chunk_size)
+        ).all()
+        if not order_ids:
+            break
+        totals.update(delete_orders(order_ids))
+        db.session.commit()
+        if job is not None:
+            job['done'] += len(order_ids)
+    
+    customer = db.session.get(Customer, customer_id)
+    if customer is not None:
+        db.session.delete(customer)
+        db.session.commit()
+    return dict(totals)
+
+def delete_product(product_id, job=None):
+    """Delete a product and the order items that reference it in chunks"""
+    chunk_size = app.config['CASCADE_DELETE_CHUNK_SIZE']
+    totals = Counter()
+    while True:
+        rows = db.session.execute(
+            select(OrderItem.id, OrderItem.order_id).where(OrderItem.product_id == product_id).order_by(OrderItem.id).limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        item_ids = [row.id for row in rows]
+        result = db.session.execute(delete(OrderItem).where(OrderItem.id.in_(item_ids)),
+                                    execution_options={'synchronize_session': False})
+        totals['order_items'] += result.rowcount
+        # The invoices of these orders no longer match what they print
+        invoice_cache.invalidate_many({row.order_id for row in rows})
+        db.session.commit()
+        if job is not None:
+            job['done'] += len(item_ids)
+    
+    product = db.session.get(Product, product_id)
+    if product is not None:
+        db.session.delete(product)
+        db.session.commit()
+    return dict(totals)
+
+def start_delete_job(kind, target_id, total, func):
+    """Run func(target_id, job) in a background thread and return the job id"""
+    job_id = uuid.uuid4().hex
+    job = {
+        'kind': kind,
+        'target_id': target_id,
+        'total': total,
+        'done': 0,
+        'status': 'running',
+        'deleted': None,
+        'error': None,
+        'created_at': time.time()
+    }
+    with delete_jobs_lock:
+        # Forget jobs older than an hour
+        cutoff = time.time() - 3600
+        for stale_id in [k for k, old in delete_jobs.items() if old['created_at'] < cutoff]:
+            del delete_jobs[stale_id]
+        delete_jobs[job_id] = job
+    
+    def run():
+        with app.app_context():
+            try:
+                job['deleted'] = func(target_id, job)
+                job['status'] = 'done'
+            except Exception as e:
+                db.session.rollback()
+                job['status'] = 'failed'
+                job['error'] = str(e)
+            finally:
+                db.session.remove()
+    
+    threading.Thread(target=run, name=f'delete-{kind}-{target_id}', daemon=True).start()
+    return job_id
+
+def delete_job_response(job_id, total, message):
+    return jsonify({
+        'message': message,
+        'job_id': job_id,
+        'total': total,
+        'status_url': url_for('delete_job_status', job_id=job_id)
+    }), 202
+
+@app.route('/api/delete-jobs/<job_id>')
+@login_required
+def delete_job_status(job_id):
+    job = delete_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify({
+        'job_id': job_id,
+        'kind': job['kind'],
+        'target_id': job['target_id'],
+        'status': job['status'],
+        'total': job['total'],
+        'done': job['done'],
+        'deleted': job['deleted'],
+        'error': job['error']
+    })
+
 @app.route('/api/customers/<int:customer_id>', methods=['PUT', 'DELETE'])
 @login_required
 def api_customer(customer_id):
@@ -1403,23 +2611,14 @@ def api_customer(customer_id):
             return jsonify({'error': str(e)}), 500
     
     elif request.method == 'DELETE':
+        # Check if customer has any orders
+        order_count = Order.query.filter_by(customer_id=customer.id).count()
+        if order_count > 0 and request.args.get('background') in ('1', 'true'):
+            job_id = start_delete_job('customer', customer.id, order_count, delete_customer)
+            return delete_job_response(job_id, order_count, f'Deleting customer and {order_count} associated order(s)')
+        
         try:
-            # Check if customer has any orders
-            order_count = Order.query.filter_by(customer_id=customer.id).count()
-            
-            if order_count > 0:
-                # Customer has orders, delete them first
-                orders_to_delete = Order.query.filter_by(customer_id=customer.id).all()
-                for order in orders_to_delete:
-                    # Delete payments and order items first
-                    for payment in order.payments:
-                        db.session.delete(payment)
-                    for item in order.items:
-                        db.session.delete(item)
-                    db.session.delete(order)
-            
-            db.session.delete(customer)
-            db.session.commit()
+            delete_customer(customer.id)
             
             if order_count > 0:
                 return jsonify({'message': f'Customer and {order_count} associated order(s) deleted successfully'})
@@ -1442,6 +2641,7 @@ def products():
 
 @app.route('/api/products', methods=['GET', 'POST'])
 @login_required
+@versioned('products')
 def api_products():
     if request.method == 'POST':
         data = request.get_json()
@@ -1471,7 +2671,7 @@ def api_products():
     return jsonify([{
         'id': p.id,
         'name': p.name,
-        'price': float(p.price),
+        'price': p.price,
         'stock_quantity': p.stock_quantity,
         'unit': p.unit
     } for p in products])
@@ -1510,18 +2710,14 @@ def api_product(product_id):
             return jsonify({'error': str(e)}), 500
     
     elif request.method == 'DELETE':
+        # Check if product has any order items
+        order_item_count = OrderItem.query.filter_by(product_id=product.id).count()
+        if order_item_count > 0 and request.args.get('background') in ('1', 'true'):
+            job_id = start_delete_job('product', product.id, order_item_count, delete_product)
+            return delete_job_response(job_id, order_item_count, f'Deleting product and {order_item_count} associated order item(s)')
+        
         try:
-            # Check if product has any order items
-            order_item_count = OrderItem.query.filter_by(product_id=product.id).count()
-            
-            if order_item_count > 0:
-                # Product has order items, delete them first
-                order_items_to_delete = OrderItem.query.filter_by(product_id=product.id).all()
-                for item in order_items_to_delete:
-                    db.session.delete(item)
-            
-            db.session.delete(product)
-            db.session.commit()
+            delete_product(product.id)
             
             if order_item_count > 0:
                 return jsonify({'message': f'Product and {order_item_count} associated order item(s) deleted successfully'})
@@ -1535,24 +2731,249 @@ def api_product(product_id):
             db.session.rollback()
             return jsonify({'error': f'Failed to delete product: {str(e)}'}), 500
 
-# Order Management
-@app.route('/orders')
-@login_required
-def orders():
-    orders = Order.query.all()
-    customers = Customer.query.all()
-    products = Product.query.all()
-    return render_template('orders.html', orders=orders, customers=customers, products=products)
+# Bulk product updates
+# Price rules select products by unit, name pattern and/or id list and apply
+# a percentage, a fixed amount or a new price; stock-take rows set counted
+# stock or apply adjustments. Each rule is one UPDATE keyed on primary keys,
+# so only the affected rows are locked, for the few milliseconds the batch
+# takes. A dry run executes the same statements and rolls them back.
+PRICE_RULE_ACTIONS = ('percent', 'amount', 'set_price')
 
-@app.route('/api/orders', methods=['GET', 'POST'])
+def parse_price_rule(rule):
+    """Build (selector condition, new price expression) for one price rule"""
+    if not isinstance(rule, dict):
+        raise ValueError('Each price rule must be an object')
+    
+    conditions = []
+    if rule.get('unit'):
+        conditions.append(Product.unit == rule['unit'])
+    if rule.get('name_pattern'):
+        pattern = rule['name_pattern'].replace('*', '%')
+        if '%' not in pattern:
+            pattern = f'%{pattern}%'
+        conditions.append(Product.name.ilike(pattern))
+    if rule.get('ids'):
+        if not all(isinstance(i, int) for i in rule['ids']):
+            raise ValueError('ids must be a list of product ids')
+        conditions.append(Product.id.in_(rule['ids']))
+    if not conditions and rule.get('all') is not True:
+        raise ValueError('Each price rule needs unit, name_pattern, ids or "all": true')
+    
+    actions = [action for action in PRICE_RULE_ACTIONS if rule.get(action) is not None]
+    if len(actions) != 1:
+        raise ValueError('Each price rule needs exactly one of percent, amount or set_price')
+    try:
+        value = Decimal(str(rule[actions[0]]))
+    except ArithmeticError:
+        raise ValueError(f'{actions[0]} must be a number')
+    
+    price = Product.__table__.c.price
+    if actions[0] == 'percent':
+        new_price = func.round(price * (1 + value / 100), 2)
+    elif actions[0] == 'amount':
+        new_price = price + value
+    else:
+        new_price = value
+    return and_(*conditions), new_price
+
+def read_stock_take(rows):
+    """Map product id to ('set', counted) or ('adjust', delta) from stock-take rows"""
+    changes = {}
+    for number, row in rows:
+        try:
+            product_id = import_int(row.get('product_id'), 'product_id')
+            if row.get('stock_quantity') not in (None, ''):
+                counted = import_int(row['stock_quantity'], 'stock_quantity')
+                if counted < 0:
+                    raise ValueError('stock_quantity cannot be negative')
+                changes[product_id] = ('set', counted)
+            elif row.get('adjustment') not in (None, ''):
+                changes[product_id] = ('adjust', import_int(row['adjustment'], 'adjustment'))
+            else:
+                raise ValueError('needs stock_quantity or adjustment')
+        except ValueError as e:
+            raise ValueError(f'Stock-take row {number}: {e}')
+    return changes
+
+def chunked(values, size):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def product_snapshot(ids):
+    products = Product.__table__
+    rows = db.session.execute(
+        select(products.c.id, products.c.name, products.c.unit, products.c.price, products.c.stock_quantity)
+        .where(products.c.id.in_(ids)).order_by(products.c.id)
+    )
+    return {row.id: row for row in rows}
+
+@app.route('/api/products/bulk-update', methods=['POST'])
 @login_required
-def api_orders():
-    if request.method == 'POST':
-        data = request.get_json()
+def bulk_update_products():
+    """Apply price rules and/or a stock-take file to many products at once"""
+    upload = request.files.get('file')
+    try:
+        if upload:
+            data = json.loads(request.form.get('rules') or '{}')
+            if isinstance(data, list):
+                data = {'price_rules': data}
+            data['dry_run'] = request.form.get('dry_run', 'false').lower() in ('1', 'true', 'yes')
+            reader = csv.DictReader(io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline=''))
+            stock_rows = [(reader.line_num, row) for row in reader]
+        else:
+            data = request.get_json() or {}
+            stock_rows = list(enumerate(data.get('stock') or [], 1))
+        rules = [parse_price_rule(rule) for rule in data.get('price_rules') or []]
+        stock_changes = read_stock_take(stock_rows)
+    except (ValueError, AttributeError, TypeError, UnicodeDecodeError, csv.Error) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if not rules and not stock_changes:
+        return jsonify({'error': 'Provide price_rules and/or stock-take rows'}), 400
+    
+    products = Product.__table__
+    chunk_size = app.config['BULK_UPDATE_CHUNK_SIZE']
+    try:
+        # Resolve every selector to ids first, then lock just those rows (in
+        # primary key order, like order creation) for the rest of the batch
+        rule_ids = [[row[0] for row in db.session.execute(select(products.c.id).where(condition))]
+                    for condition, _ in rules]
+        unknown = sorted(set(stock_changes) - set(product_snapshot(list(stock_changes))))
+        if unknown:
+            db.session.rollback()
+            return jsonify({'error': f"Product(s) not found: {', '.join(map(str, unknown))}"}), 400
+        
+        affected = sorted(set().union(set(stock_changes), *rule_ids))
+        for ids in chunked(affected, chunk_size):
+            db.session.execute(select(products.c.id).where(products.c.id.in_(ids)).order_by(products.c.id).with_for_update()).all()
+        before = product_snapshot(affected)
+        
+        for (_, new_price), ids in zip(rules, rule_ids):
+            for chunk in chunked(ids, chunk_size):
+                db.session.execute(update(products).where(products.c.id.in_(chunk)).values(price=new_price))
+        
+        for mode in ('set', 'adjust'):
+            targets = {pid: value for pid, (kind, value) in stock_changes.items() if kind == mode}
+            for chunk in chunked(sorted(targets), chunk_size):
+                value = case({pid: targets[pid] for pid in chunk}, value=products.c.id)
+                new_stock = value if mode == 'set' else products.c.stock_quantity + value
+                db.session.execute(update(products).where(products.c.id.in_(chunk)).values(stock_quantity=new_stock))
+        
+        after = product_snapshot(affected)
+        invalid = [after[pid].name for pid in affected if after[pid].price < 0 or after[pid].stock_quantity < 0]
+        if invalid:
+            db.session.rollback()
+            return jsonify({'error': f"Negative price or stock would result for: {', '.join(invalid)}"}), 400
+        
+        if data.get('dry_run'):
+            db.session.rollback()
+        else:
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Bulk update failed: {str(e)}'}), 500
+    
+    changed = [pid for pid in affected
+               if (before[pid].price, before[pid].stock_quantity) != (after[pid].price, after[pid].stock_quantity)]
+    return jsonify({
+        'message': f"{len(changed)} product(s) {'would be ' if data.get('dry_run') else ''}updated",
+        'dry_run': bool(data.get('dry_run')),
+        'affected': len(changed),
+        'products': [{
+            'id': pid,
+            'name': after[pid].name,
+            'unit': after[pid].unit,
+            'old_price': before[pid].price,
+            'new_price': after[pid].price,
+            'old_stock': before[pid].stock_quantity,
+            'new_stock': after[pid].stock_quantity
+        } for pid in changed],
+        'totals': {
+            'stock_units_before': sum(before[pid].stock_quantity for pid in changed),
+            'stock_units_after': sum(after[pid].stock_quantity for pid in changed),
+            'stock_value_before': sum(before[pid].price * before[pid].stock_quantity for pid in changed),
+            'stock_value_after': sum(after[pid].price * after[pid].stock_quantity for pid in changed)
+        }
+    })
+
+# Order Management
+@app.route('/orders')
+@login_required
+def orders():
+    # Orders are fetched page by page through /api/orders
+    customers = Customer.query.all()
+    products = Product.query.all()
+    return render_template('orders.html', customers=customers, products=products)
+
+def requested_quantities(items):
+    """Total quantity per product id for an order's line items"""
+    requested = Counter()
+    for item in items:
+        product_id = item.get('product_id')
+        quantity = item.get('quantity')
+        if not isinstance(product_id, int) or not isinstance(quantity, int) or quantity <= 0:
+            raise ValueError('Each item needs a product_id and a positive whole quantity')
+        requested[product_id] += quantity
+    return requested
+
+def stock_shortages(products, requested):
+    """Every product whose stock cannot cover the requested quantity"""
+    return [{
+        'product_id': product_id,
+        'product_name': products[product_id].name,
+        'requested': quantity,
+        'available': products[product_id].stock_quantity
+    } for product_id, quantity in sorted(requested.items())
+        if products[product_id].stock_quantity < quantity]
+
+def reserve_stock(requested):
+    """Decrement stock for all products in one conditional UPDATE.
+    
+    Rows are only changed while they still hold enough stock, and the
+    database row locks taken by the UPDATE serialize concurrent orders, so
+    stock can never go negative. Returns False (having changed nothing the
+    caller will commit) if any product fell short.
+    """
+    products = Product.__table__
+    quantity = case(dict(requested), value=products.c.id)
+    result = db.session.execute(
+        update(products).where(
+            products.c.id.in_(list(requested)),
+            products.c.stock_quantity >= quantity
+        ).values(stock_quantity=products.c.stock_quantity - quantity)
+    )
+    return result.rowcount == len(requested)
+
+def insufficient_stock_response(shortages):
+    lines = ', '.join(f"{s['product_name']} (requested {s['requested']}, available {s['available']})" for s in shortages)
+    return jsonify({'error': f'Insufficient stock for {lines}', 'shortages': shortages}), 409
+
+@app.route('/api/orders', methods=['GET', 'POST'])
+@login_required
+def api_orders():
+    if request.method == 'POST':
+        data = request.get_json()
         
         if not all(key in data for key in ['customer_id', 'order_date', 'items']):
             return jsonify({'error': 'Missing required fields'}), 400
         
+        try:
+            requested = requested_quantities(data['items'])
+        except (AttributeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        if not requested:
+            return jsonify({'error': 'Order must contain at least one item'}), 400
+        
+        # All referenced products in one query; check every line before writing
+        products = {p.id: p for p in Product.query.filter(Product.id.in_(list(requested))).all()}
+        missing = sorted(set(requested) - set(products))
+        if missing:
+            return jsonify({'error': f"Product(s) not found: {', '.join(map(str, missing))}"}), 400
+        shortages = stock_shortages(products, requested)
+        if shortages:
+            return insufficient_stock_response(shortages)
+        
         # Create order
         order = Order(
             customer_id=data['customer_id'],
@@ -1568,22 +2989,24 @@ def api_orders():
             db.session.add(order)
             db.session.flush()  # Get the order ID
             
+            # Another counter may have sold the stock since the check above
+            if not reserve_stock(requested):
+                db.session.rollback()
+                products = {p.id: p for p in Product.query.filter(Product.id.in_(list(requested))).all()}
+                shortages = stock_shortages(products, requested)
+                if shortages:
+                    return insufficient_stock_response(shortages)
+                return jsonify({'error': 'Stock changed while the order was being placed, please try again'}), 409
+            for product in products.values():
+                db.session.expire(product, ['stock_quantity'])
+            
             # Add order items
             for item_data in data['items']:
-                product = Product.query.get(item_data['product_id'])
-                if not product:
-                    raise Exception(f"Product {item_data['product_id']} not found")
+                product = products[item_data['product_id']]
                 
-                if product.stock_quantity < item_data['quantity']:
-                    raise Exception(f"Insufficient stock for {product.name}")
-                
-                # Update stock
-                product.stock_quantity -= item_data['quantity']
-                
-                # Create order item
                 order_item = OrderItem(
                     order_id=order.id,
-                    product_id=item_data['product_id'],
+                    product_id=product.id,
                     quantity=item_data['quantity'],
                     price=product.price
                 )
@@ -1624,25 +3047,61 @@ def api_orders():
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
     
-    orders = Order.query.all()
-    return jsonify([{
-        'id': o.id,
-        'customer_name': o.customer.name,
-        'order_date': o.order_date.strftime('%Y-%m-%d'),
-        'delivery_date': o.delivery_date.strftime('%Y-%m-%d') if o.delivery_date else None,
-        'total_amount': float(o.total_amount),
-        'payment_status': o.payment_status,
-        'paid_amount': sum(float(p.amount) for p in o.payments),
-        'items': [{
-            'product_name': item.product.name,
-            'quantity': item.quantity,
-            'price': float(item.price)
-        } for item in o.items]
-    } for o in orders])
+    # Server-side filters: free text (customer name or order id), payment
+    # status (comma separated), order date range and customer
+    try:
+        query = order_list_query()
+        
+        q = request.args.get('q', '').strip()
+        if q:
+            conditions = [Customer.name.ilike(f'%{q}%')]
+            if q.lstrip('#').isdigit():
+                conditions.append(Order.id == int(q.lstrip('#')))
+            query = query.filter(or_(*conditions))
+        
+        status = request.args.get('status')
+        if status:
+            query = query.filter(Order.payment_status.in_(status.split(',')))
+        
+        # Outstanding orders list the biggest balances first, so the page is a
+        # range scan of ix_orders_balance_due rather than a walk of every order
+        default_sort = '-id'
+        if request.args.get('outstanding'):
+            query = query.filter(owing_condition())
+            default_sort = '-balance_due'
+        
+        customer_id = request.args.get('customer_id', type=int)
+        if customer_id:
+            query = query.filter(Order.customer_id == customer_id)
+        
+        start = parse_date_arg('start_date')
+        end = parse_date_arg('end_date')
+        if start:
+            query = query.filter(Order.order_date >= start)
+        if end:
+            query = query.filter(Order.order_date <= end)
+        
+        orders, next_cursor = keyset_paginate(query, Order, {
+            'id': Order.id,
+            'order_date': Order.order_date,
+            'total_amount': Order.total_amount,
+            'balance_due': Order.balance_due
+        }, default_sort)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'items': [serialize_order(o) for o in orders],
+        'next_cursor': next_cursor
+    })
 
-@app.route('/api/orders/<int:order_id>', methods=['PUT', 'DELETE'])
+@app.route('/api/orders/<int:order_id>', methods=['GET', 'PUT', 'DELETE'])
 @login_required
 def api_order(order_id):
+    if request.method == 'GET':
+        order = order_list_query().filter(Order.id == order_id).first_or_404()
+        return jsonify(serialize_order(order))
+    
     order = Order.query.get_or_404(order_id)
     
     if request.method == 'PUT':
@@ -1691,23 +3150,10 @@ def api_order(order_id):
     
     elif request.method == 'DELETE':
         try:
-            # First, explicitly delete all payments associated with this order
-            # to avoid foreign key constraint issues
-            payments_to_delete = Payment.query.filter_by(order_id=order.id).all()
-            payment_count = len(payments_to_delete)
-            for payment in payments_to_delete:
-                db.session.delete(payment)
-            
-            # Restore stock quantities
-            item_count = len(order.items)
-            for item in order.items:
-                product = Product.query.get(item.product_id)
-                if product:
-                    product.stock_quantity += item.quantity
-            
-            # Now delete the order
-            db.session.delete(order)
+            counts = cancel_orders([order.id])
             db.session.commit()
+            payment_count = counts['payments']
+            item_count = counts['order_items']
             
             message = f'Order deleted successfully'
             if payment_count > 0:
@@ -1723,29 +3169,396 @@ def api_order(order_id):
             db.session.rollback()
             return jsonify({'error': f'Failed to delete order: {str(e)}'}), 500
 
+# Order cancellation
+# Deleting orders puts their items back in stock with one grouped UPDATE and
+# removes payments, items and orders with set-based DELETEs, whatever the
+# number of orders. POST /api/orders/cancel selects orders the same way as
+# bulk invoices; each CASCADE_DELETE_CHUNK_SIZE orders commit together.
+def cancel_orders(order_ids):
+    """Restore stock for the given orders and delete them (caller commits)"""
+    # Locking the orders first stops a concurrent cancel restoring stock twice
+    order_ids = db.session.scalars(
+        select(Order.id).where(Order.id.in_(order_ids)).with_for_update()
+    ).all()
+    counts = {'orders': 0, 'payments': 0, 'order_items': 0, 'units_restored': 0, 'restocked': set()}
+    if not order_ids:
+        return counts
+    
+    restock = dict(db.session.execute(
+        select(OrderItem.product_id, func.sum(OrderItem.quantity))
+        .where(OrderItem.order_id.in_(order_ids))
+        .group_by(OrderItem.product_id)
+    ).all())
+    if restock:
+        products = Product.__table__
+        db.session.execute(
+            update(products).where(products.c.id.in_(list(restock)))
+            .values(stock_quantity=products.c.stock_quantity + case(restock, value=products.c.id))
+        )
+        counts['restocked'] = set(restock)
+        counts['units_restored'] = int(sum(restock.values()))
+    
+    counts.update(delete_orders(order_ids))
+    return counts
+
+@app.route('/api/orders/cancel', methods=['POST'])
+@login_required
+def cancel_orders_route():
+    """Delete the selected orders and put their items back in stock"""
+    data = request.get_json() or {}
+    query = db.session.query(Order.id)
+    
+    try:
+        if data.get('order_ids'):
+            query = query.filter(Order.id.in_([int(order_id) for order_id in data['order_ids']]))
+        if data.get('customer_id'):
+            query = query.filter(Order.customer_id == int(data['customer_id']))
+        if data.get('order_date'):
+            query = query.filter(Order.order_date == datetime.strptime(data['order_date'], '%Y-%m-%d').date())
+        if data.get('start_date'):
+            query = query.filter(Order.order_date >= datetime.strptime(data['start_date'], '%Y-%m-%d').date())
+        if data.get('end_date'):
+            query = query.filter(Order.order_date <= datetime.strptime(data['end_date'], '%Y-%m-%d').date())
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid selection: {e}'}), 400
+    
+    if not any(data.get(key) for key in ['order_ids', 'customer_id', 'order_date', 'start_date', 'end_date']):
+        return jsonify({'error': 'Select orders by order_ids, customer_id, order_date or a date range'}), 400
+    
+    order_ids = [row.id for row in query.order_by(Order.id).all()]
+    if not order_ids:
+        return jsonify({'error': 'No orders match the selection'}), 404
+    
+    chunk_size = app.config['CASCADE_DELETE_CHUNK_SIZE']
+    totals = Counter()
+    restocked = set()
+    try:
+        for chunk in chunked(order_ids, chunk_size):
+            counts = cancel_orders(chunk)
+            restocked |= counts.pop('restocked')
+            totals.update(counts)
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f"Failed to cancel orders ({totals['orders']} already cancelled): {str(e)}"}), 500
+    
+    return jsonify({
+        'message': f"{totals['orders']} order(s) cancelled; stock restored for {len(restocked)} product(s)",
+        'cancelled': totals['orders'],
+        'payments_deleted': totals['payments'],
+        'items_deleted': totals['order_items'],
+        'products_restocked': len(restocked),
+        'units_restored': totals['units_restored']
+    })
+
+# Bulk order import
+# Accepts CSV (one row per order line, grouped by order_ref) or JSON Lines (one
+# /api/orders style order per line). Every order is validated against products
+# and customers loaded once up front; valid orders are written with bulk
+# inserts and a single stock UPDATE, invalid ones are reported by row.
+IMPORT_CSV_COLUMNS = ['order_ref', 'customer_id', 'order_date', 'delivery_date', 'delivery_address',
+                      'payment_status', 'payment_amount', 'payment_method', 'product_id', 'quantity']
+
+def import_format(upload):
+    """Work out whether the import is CSV or JSON Lines"""
+    fmt = request.args.get('format')
+    if not fmt and upload and upload.filename:
+        fmt = upload.filename.rsplit('.', 1)[-1]
+    if not fmt:
+        fmt = request.mimetype.split('/')[-1]
+    fmt = fmt.lower()
+    if fmt in ('csv', 'text/csv'):
+        return 'csv'
+    if fmt in ('jsonl', 'ndjson', 'x-ndjson', 'jsonlines', 'json'):
+        return 'jsonl'
+    raise ValueError('Import must be CSV or JSON Lines (use ?format=csv or ?format=jsonl)')
+
+def read_csv_orders(stream):
+    """Return (row number, order dict) pairs with the lines of each order_ref grouped together"""
+    reader = csv.DictReader(stream)
+    missing = {'customer_id', 'order_date', 'product_id', 'quantity'} - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+    
+    orders = OrderedDict()
+    for row in reader:
+        row_number = reader.line_num
+        ref = (row.get('order_ref') or '').strip() or f'row-{row_number}'
+        if ref not in orders:
+            order = {key: value.strip() for key, value in row.items()
+                     if key in IMPORT_CSV_COLUMNS and value and key not in ('product_id', 'quantity')}
+            order['items'] = []
+            orders[ref] = (row_number, order)
+        orders[ref][1]['items'].append({'product_id': row.get('product_id'), 'quantity': row.get('quantity')})
+    return list(orders.values())
+
+def read_jsonl_orders(stream):
+    """Return (line number, order dict or parse error) pairs for each non-blank line"""
+    records = []
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError('each line must be a JSON object')
+        except ValueError as e:
+            record = ValueError(f'Invalid JSON: {e}')
+        records.append((line_number, record))
+    return records
+
+def import_int(value, field):
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        raise ValueError(f'{field} must be a whole number')
+
+def import_date(value, field):
+    try:
+        return datetime.strptime(str(value).strip(), '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'{field} must be a date in YYYY-MM-DD format')
+
+def plan_import_order(data, customer_ids, products, available):
+    """Validate one imported order and reserve its stock in the running tally"""
+    missing = [key for key in ('customer_id', 'order_date', 'items') if not data.get(key)]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+    
+    customer_id = import_int(data['customer_id'], 'customer_id')
+    if customer_id not in customer_ids:
+        raise ValueError(f'Customer {customer_id} not found')
+    
+    order_date = import_date(data['order_date'], 'order_date')
+    delivery_date = import_date(data['delivery_date'], 'delivery_date') if data.get('delivery_date') else None
+    status = data.get('payment_status') or 'Unpaid'
+    if status not in ('Paid', 'Unpaid', 'Partial'):
+        raise ValueError('payment_status must be Paid, Unpaid or Partial')
+    try:
+        paid = Decimal(str(data.get('payment_amount') or 0))
+    except ArithmeticError:
+        raise ValueError('payment_amount must be a number')
+    if paid < 0:
+        raise ValueError('payment_amount cannot be negative')
+    
+    lines = [(import_int(item.get('product_id'), 'product_id'), import_int(item.get('quantity'), 'quantity'))
+             for item in data['items']]
+    requested = requested_quantities([{'product_id': p, 'quantity': q} for p, q in lines])
+    unknown = sorted(set(requested) - set(products))
+    if unknown:
+        raise ValueError(f"Product(s) not found: {', '.join(map(str, unknown))}")
+    short = [f"{products[p].name} (requested {q}, available {available[p]})"
+             for p, q in sorted(requested.items()) if available[p] < q]
+    if short:
+        raise ValueError(f"Insufficient stock for {', '.join(short)}")
+    
+    for product_id, quantity in requested.items():
+        available[product_id] -= quantity
+    
+    total = sum((products[p].price * q for p, q in lines), Decimal('0'))
+    paid = paid if status in ('Paid', 'Partial') else Decimal('0')
+    order = {
+        'customer_id': customer_id,
+        'order_date': order_date,
+        'delivery_date': delivery_date,
+        'delivery_address': data.get('delivery_address') or '',
+        'total_amount': total,
+        'payment_status': status,
+        'paid_amount': paid,
+        'balance_due': total - paid,
+        'created_at': datetime.utcnow(),
+        'updated_at': datetime.utcnow()
+    }
+    items = [{'product_id': p, 'quantity': q, 'price': products[p].price} for p, q in lines]
+    return order, items, requested, data.get('payment_method') or 'Cash'
+
+# Rows per multi-row INSERT on MySQL, keeping each statement well under
+# max_allowed_packet
+IMPORT_INSERT_BATCH_SIZE = 1000
+
+def insert_orders(rows):
+    """Insert order rows in bulk, returning the new ids in row order"""
+    orders = Order.__table__
+    if db.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+        result = db.session.execute(insert(orders).returning(orders.c.id, sort_by_parameter_order=True), rows)
+        return [row[0] for row in result]
+    
+    # MySQL has no INSERT ... RETURNING. InnoDB gives the rows of one
+    # multi-row INSERT consecutive ids from LAST_INSERT_ID() when it reserves
+    # them per statement (autoinc lock modes 0 and 1) and the increment is 1;
+    # otherwise the ids can interleave with other sessions' inserts, so rows
+    # go in one statement at a time
+    connection = db.session.connection()
+    lock_mode, increment = connection.exec_driver_sql(
+        'SELECT @@innodb_autoinc_lock_mode, @@auto_increment_increment').one()
+    if lock_mode not in (0, 1) or increment != 1:
+        return [db.session.execute(insert(orders), row).inserted_primary_key[0] for row in rows]
+    
+    ids = []
+    for start in range(0, len(rows), IMPORT_INSERT_BATCH_SIZE):
+        batch = rows[start:start + IMPORT_INSERT_BATCH_SIZE]
+        db.session.execute(insert(orders).values(batch))
+        first_id = db.session.execute(select(func.last_insert_id())).scalar()
+        ids.extend(range(first_id, first_id + len(batch)))
+    return ids
+
+@app.route('/api/orders/import', methods=['POST'])
+@login_required
+def import_orders():
+    """Create many orders from an uploaded CSV or JSON Lines file"""
+    upload = request.files.get('file')
+    try:
+        fmt = import_format(upload)
+        if upload:
+            stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+        else:
+            stream = io.StringIO(request.get_data(as_text=True), newline='')
+        records = read_csv_orders(stream) if fmt == 'csv' else read_jsonl_orders(stream)
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if not records:
+        return jsonify({'error': 'No orders found in the import'}), 400
+    if len(records) > app.config['IMPORT_MAX_ORDERS']:
+        return jsonify({'error': f"Imports are limited to {app.config['IMPORT_MAX_ORDERS']} orders"}), 400
+    
+    # Preload the customers and products the file refers to; product rows stay
+    # locked until commit so the stock tally cannot go stale underneath us
+    customer_refs, product_refs = set(), set()
+    for _, data in records:
+        if isinstance(data, dict):
+            customer_refs.add(str(data.get('customer_id')).strip())
+            if isinstance(data.get('items'), list):
+                product_refs.update(str(item.get('product_id')).strip()
+                                    for item in data['items'] if isinstance(item, dict))
+    customer_keys = [int(ref) for ref in customer_refs if ref.isdigit()]
+    product_keys = [int(ref) for ref in product_refs if ref.isdigit()]
+    customer_ids = {row[0] for row in db.session.query(Customer.id).filter(Customer.id.in_(customer_keys))}
+    products = {p.id: p for p in Product.query.filter(Product.id.in_(product_keys)).with_for_update()}
+    available = {product_id: product.stock_quantity for product_id, product in products.items()}
+    
+    errors = []
+    planned = []
+    for row_number, data in records:
+        ref = (data.get('order_ref') or data.get('ref')) if isinstance(data, dict) else None
+        try:
+            if isinstance(data, Exception):
+                raise data
+            if not isinstance(data.get('items'), list) or not all(isinstance(i, dict) for i in data['items']):
+                raise ValueError('items must be a list of {product_id, quantity} objects')
+            planned.append(plan_import_order(data, customer_ids, products, available))
+        except ValueError as e:
+            errors.append({'row': row_number, 'order_ref': ref, 'error': str(e)})
+    
+    if not planned:
+        db.session.rollback()
+        return jsonify({'message': 'No orders imported', 'imported': 0, 'rejected': len(errors),
+                        'order_ids': [], 'errors': errors}), 400
+    
+    try:
+        requested = Counter()
+        for _, _, order_requested, _ in planned:
+            requested.update(order_requested)
+        if not reserve_stock(requested):
+            db.session.rollback()
+            return jsonify({'error': 'Stock changed while the import was running, please try again'}), 409
+        
+        order_ids = insert_orders([order for order, _, _, _ in planned])
+        
+        item_rows = []
+        payment_rows = []
+        for order_id, (order, items, _, method) in zip(order_ids, planned):
+            item_rows.extend(dict(item, order_id=order_id, created_at=order['created_at']) for item in items)
+            if order['paid_amount'] > 0:
+                if order['payment_status'] == 'Paid':
+                    notes = f"Full payment of ${order['paid_amount']:.2f} recorded when order was imported"
+                else:
+                    notes = f"Partial payment of ${order['paid_amount']:.2f} recorded when order was imported (Outstanding: ${order['balance_due']:.2f})"
+                payment_rows.append({
+                    'order_id': order_id,
+                    'amount': order['paid_amount'],
+                    'payment_date': order['order_date'],
+                    'payment_method': method,
+                    'notes': notes,
+                    'created_at': order['created_at']
+                })
+        
+        db.session.execute(insert(OrderItem.__table__), item_rows)
+        if payment_rows:
+            db.session.execute(insert(Payment.__table__), payment_rows)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        return jsonify({'error': f'Import failed due to database constraints: {str(e)}'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Import failed: {str(e)}'}), 500
+    
+    return jsonify({
+        'message': f'{len(order_ids)} order(s) imported, {len(errors)} rejected',
+        'imported': len(order_ids),
+        'rejected': len(errors),
+        'order_ids': order_ids,
+        'errors': errors
+    })
+
 # Payment Management
 @app.route('/payments')
 @login_required
 def payments():
-    payments = Payment.query.all()
-    orders = Order.query.all()
-    return render_template('payments.html', payments=payments, orders=orders)
+    # Orders, payments and totals are fetched through the paginated APIs
+    return render_template('payments.html')
 
 @app.route('/api/payments', methods=['GET', 'POST'])
 @login_required
 def api_payments():
     if request.method == 'GET':
-        # Return all payments with order and customer details
-        payments = Payment.query.all()
-        return jsonify([{
-            'id': p.id,
-            'order_id': p.order_id,
-            'customer_name': p.order.customer.name,
-            'payment_date': p.payment_date.strftime('%Y-%m-%d'),
-            'amount': float(p.amount),
-            'payment_method': p.payment_method,
-            'notes': p.notes
-        } for p in payments])
+        # Return a page of payments with order and customer details
+        try:
+            query = payment_list_query()
+            
+            q = request.args.get('q', '').strip()
+            if q:
+                conditions = [Customer.name.ilike(f'%{q}%')]
+                if q.lstrip('#').isdigit():
+                    conditions.append(Payment.order_id == int(q.lstrip('#')))
+                query = query.filter(or_(*conditions))
+            
+            order_id = request.args.get('order_id', type=int)
+            if order_id:
+                query = query.filter(Payment.order_id == order_id)
+            
+            method = request.args.get('method')
+            if method:
+                query = query.filter(Payment.payment_method == method)
+            
+            start = parse_date_arg('start_date')
+            end = parse_date_arg('end_date')
+            if start:
+                query = query.filter(Payment.payment_date >= start)
+            if end:
+                query = query.filter(Payment.payment_date <= end)
+            
+            payments, next_cursor = keyset_paginate(query, Payment, {
+                'id': Payment.id,
+                'payment_date': Payment.payment_date,
+                'amount': Payment.amount
+            }, '-id')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'items': [{
+                'id': p.id,
+                'order_id': p.order_id,
+                'customer_name': p.order.customer.name,
+                'payment_date': p.payment_date,
+                'amount': p.amount,
+                'payment_method': p.payment_method,
+                'notes': p.notes
+            } for p in payments],
+            'next_cursor': next_cursor
+        })
     
     elif request.method == 'POST':
         data = request.get_json()
@@ -1763,14 +3576,14 @@ def api_payments():
         
         try:
             db.session.add(payment)
+            db.session.flush()  # Applies the payment to the order's balance
             
             # Update order payment status
-            order = Order.query.get(data['order_id'])
+            order = db.session.get(Order, data['order_id'])
             if order:
-                total_paid = sum(float(p.amount) for p in order.payments) + float(data['amount'])
-                if total_paid >= float(order.total_amount):
+                if order.balance_due <= 0:
                     order.payment_status = 'Paid'
-                elif total_paid > 0:
+                elif order.paid_amount > 0:
                     order.payment_status = 'Partial'
             
             db.session.commit()
@@ -1784,6 +3597,28 @@ def api_payments():
             return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/payments/summary')
+@login_required
+def payment_summary():
+    """Outstanding, paid and partial totals across all orders"""
+    total_paid = db.session.query(func.coalesce(func.sum(Order.total_amount), 0)).filter(
+        Order.payment_status == 'Paid').scalar_subquery()
+    
+    # The owing totals read only the balance_due > 0 range of the index
+    totals = db.session.query(
+        total_paid,
+        func.coalesce(func.sum(Order.balance_due), 0),
+        func.coalesce(func.sum(case((Order.paid_amount > 0, Order.balance_due), else_=0)), 0),
+        func.count(distinct(Order.customer_id))
+    ).filter(owing_condition()).one()
+    
+    return jsonify({
+        'total_paid': totals[0],
+        'total_outstanding': totals[1],
+        'total_partial': totals[2],
+        'customers_with_debt': totals[3]
+    })
+
 
 # Reports
 @app.route('/reports')
@@ -1791,110 +3626,612 @@ def api_payments():
 def reports():
     return render_template('reports.html')
 
-@app.route('/api/dashboard/pending-deliveries')
-@login_required
-def pending_deliveries():
+def pending_deliveries_data():
+    """Orders due for delivery today or tomorrow"""
     today = date.today()
     tomorrow = today + timedelta(days=1)
     
-    # Get orders with delivery dates for today and tomorrow
-    pending_deliveries = Order.query.filter(
+    pending_deliveries = order_customer_query().filter(
         Order.delivery_date.in_([today, tomorrow])
     ).order_by(Order.delivery_date, Order.id).all()
     
-    return jsonify([{
+    return [{
         'id': order.id,
         'customer_name': order.customer.name,
-        'order_date': order.order_date.strftime('%Y-%m-%d'),
-        'delivery_date': order.delivery_date.strftime('%Y-%m-%d') if order.delivery_date else None,
-        'total_amount': float(order.total_amount),
+        'order_date': order.order_date,
+        'delivery_date': order.delivery_date,
+        'total_amount': order.total_amount,
         'payment_status': order.payment_status,
         'delivery_address': order.delivery_address
-    } for order in pending_deliveries])
+    } for order in pending_deliveries]
+
+@app.route('/api/dashboard/pending-deliveries')
+@login_required
+def pending_deliveries():
+    return jsonify(pending_deliveries_data())
+
+# Dashboard live updates
+# Open dashboards hold a server-sent events stream. When orders, payments,
+# customers or products change, one background thread per worker recomputes
+# the dashboard figures and pending deliveries once and hands the result to
+# every stream, instead of each tab polling. Commits made in this process wake
+# it at once; writes made by other workers are noticed from table_versions,
+# which it reads every DASHBOARD_STREAM_CHECK_SECONDS. Streams send a heartbeat
+# comment and end after DASHBOARD_STREAM_MAX_SECONDS (the browser reconnects),
+# and each one holds a worker thread while open, so they need a threaded or
+# gevent worker class; with DASHBOARD_STREAM_ENABLED off dashboards poll.
+DASHBOARD_TABLES = ['orders', 'payments', 'customers', 'products']
+
+class DashboardNotifier:
+    """Fans one dashboard snapshot per change out to all open streams"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.changed = threading.Event()
+        self.subscribers = set()
+        self.snapshot = None
+        self.snapshot_date = None
+        self.thread = None
+    
+    def subscribe(self):
+        """Register a stream; returns its queue, or None if the limit is reached"""
+        subscription = queue.Queue(maxsize=1)
+        with self.lock:
+            if len(self.subscribers) >= app.config['DASHBOARD_STREAM_MAX_CLIENTS']:
+                return None
+            self.subscribers.add(subscription)
+            snapshot = self.snapshot if self.snapshot_date == date.today() else None
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='dashboard-notifier', daemon=True)
+                self.thread.start()
+        if snapshot:
+            self.deliver(subscription, snapshot)
+        else:
+            self.changed.set()
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscribers.discard(subscription)
+    
+    def notify(self, tables):
+        if tables & set(DASHBOARD_TABLES):
+            with self.lock:
+                self.snapshot = None
+            self.changed.set()
+    
+    @staticmethod
+    def deliver(subscription, snapshot):
+        # Slow readers only ever need the newest snapshot
+        try:
+            subscription.get_nowait()
+        except queue.Empty:
+            pass
+        subscription.put_nowait(snapshot)
+    
+    def run(self):
+        seen = None
+        while True:
+            woken = self.changed.wait(app.config['DASHBOARD_STREAM_CHECK_SECONDS'])
+            if woken:
+                time.sleep(app.config['DASHBOARD_STREAM_DEBOUNCE_SECONDS'])
+                self.changed.clear()
+            
+            with self.lock:
+                if not self.subscribers:
+                    continue
+            try:
+                with app.app_context():
+                    try:
+                        # Unchanged counters mean no worker wrote anything; the
+                        # date check rolls "today" over at midnight
+                        versions = table_versions.current(DASHBOARD_TABLES)
+                        if not woken and versions == seen and self.snapshot_date == date.today():
+                            continue
+                        snapshot = app.json.dumps({
+                            'summary': dashboard_summary(),
+                            'pending_deliveries': pending_deliveries_data()
+                        })
+                    finally:
+                        db.session.remove()
+            except Exception as e:
+                print(f"Dashboard notifier failed to refresh: {e}")
+                continue
+            
+            seen = versions
+            with self.lock:
+                self.snapshot = snapshot
+                self.snapshot_date = date.today()
+                subscribers = list(self.subscribers)
+            for subscription in subscribers:
+                self.deliver(subscription, snapshot)
+
+dashboard_notifier = DashboardNotifier()
+table_versions.on_commit(dashboard_notifier.notify)
+
+@app.route('/api/dashboard/stream')
+@login_required
+def dashboard_stream():
+    """Server-sent events carrying the dashboard figures and pending deliveries"""
+    if not app.config['DASHBOARD_STREAM_ENABLED']:
+        return jsonify({'error': 'Dashboard streaming is disabled'}), 404
+    subscription = dashboard_notifier.subscribe()
+    if subscription is None:
+        return jsonify({'error': 'Too many open dashboard streams'}), 503
+    keepalive = app.config['DASHBOARD_STREAM_KEEPALIVE_SECONDS']
+    deadline = time.monotonic() + app.config['DASHBOARD_STREAM_MAX_SECONDS']
+    
+    def events():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                # Ending the stream frees this worker thread; the browser
+                # reconnects after the retry delay and gets the latest snapshot
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    snapshot = subscription.get(timeout=min(keepalive, remaining))
+                except queue.Empty:
+                    yield ': heartbeat\n\n'
+                    continue
+                yield f'event: dashboard\ndata: {snapshot}\n\n'
+        finally:
+            dashboard_notifier.unsubscribe(subscription)
+    
+    response = Response(events(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/api/reports/sales')
 @login_required
 def sales_report():
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
+    """Order-line report, one page at a time"""
+    try:
+        start, end = report_date_range()
+        cursor = request.args.get('cursor')
+        after = decode_sales_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    if start_date and end_date:
-        start = datetime.strptime(start_date, '%Y-%m-%d').date()
-        end = datetime.strptime(end_date, '%Y-%m-%d').date()
-        orders = Order.query.filter(Order.order_date.between(start, end)).all()
-    else:
-        # Default to current month
-        first_day = date.today().replace(day=1)
-        orders = Order.query.filter(Order.order_date >= first_day).all()
-    
-    report_data = []
-    for order in orders:
-        for item in order.items:
-            report_data.append({
-                'order_id': order.id,
-                'date': order.order_date.strftime('%Y-%m-%d'),
-                'customer': order.customer.name,
-                'product': item.product.name,
-                'quantity': item.quantity,
-                'price': float(item.price),
-                'total': float(item.price) * item.quantity,
-                'payment_status': order.payment_status
-            })
-    
-    return jsonify(report_data)
+    limit = request.args.get('limit', app.config['ITEMS_PER_PAGE'], type=int)
+    limit = max(1, min(limit, app.config['MAX_ITEMS_PER_PAGE']))
+    
+    lines = sales_lines_query(start, end, after).limit(limit + 1).all()
+    next_cursor = None
+    if len(lines) > limit:
+        lines = lines[:limit]
+        last = lines[-1]
+        next_cursor = encode_cursor(last.order_date, last.order_id, last.id)
+    
+    return jsonify({
+        'items': [{
+            'order_id': line.order_id,
+            'date': line.order_date,
+            'customer': line.customer_name,
+            'product': line.product_name,
+            'quantity': line.quantity,
+            'price': line.price,
+            'total': line.price * line.quantity,
+            'payment_status': line.payment_status
+        } for line in lines],
+        'next_cursor': next_cursor
+    })
 
-@app.route('/api/reports/export-csv')
+def report_limit():
+    """Row limit for grouped reports"""
+    limit = request.args.get('limit', app.config['ITEMS_PER_PAGE'], type=int)
+    return max(1, min(limit, app.config['MAX_ITEMS_PER_PAGE']))
+
+@app.route('/api/reports/summary')
 @login_required
-def export_csv():
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
+def report_summary():
+    """Sales totals for the report range"""
+    try:
+        start, end = report_date_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    if start_date and end_date:
-        start = datetime.strptime(start_date, '%Y-%m-%d').date()
-        end = datetime.strptime(end_date, '%Y-%m-%d').date()
-        orders = Order.query.filter(Order.order_date.between(start, end)).all()
-    else:
-        first_day = date.today().replace(day=1)
-        orders = Order.query.filter(Order.order_date >= first_day).all()
+    line_total = OrderItem.price * OrderItem.quantity
+    totals = db.session.query(
+        func.coalesce(func.sum(line_total), 0),
+        func.count(distinct(Order.id)),
+        func.count(distinct(Order.customer_id))
+    ).select_from(OrderItem).join(
+        Order, OrderItem.order_id == Order.id
+    ).filter(report_range_condition(start, end)).one()
     
-    # Create CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['Order ID', 'Date', 'Customer', 'Product', 'Quantity', 'Price', 'Total', 'Payment Status'])
+    total_sales = Decimal(totals[0])
+    total_orders = totals[1]
+    average = total_sales / total_orders if total_orders else Decimal('0')
     
-    for order in orders:
-        for item in order.items:
+    return jsonify({
+        'total_sales': total_sales,
+        'total_orders': total_orders,
+        'unique_customers': totals[2],
+        'average_order_value': average.quantize(Decimal('0.01'))
+    })
+
+@app.route('/api/reports/revenue')
+@login_required
+def report_revenue():
+    """Revenue grouped by day, week or month"""
+    try:
+        start, end = report_date_range()
+        period = report_period_expression(request.args.get('period', 'day'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    rows = db.session.query(
+        period.label('period'),
+        func.count(distinct(Order.id)),
+        func.coalesce(func.sum(OrderItem.price * OrderItem.quantity), 0)
+    ).select_from(OrderItem).join(
+        Order, OrderItem.order_id == Order.id
+    ).filter(report_range_condition(start, end)).group_by(period).order_by(period).all()
+    
+    return jsonify([{
+        'period': row[0],
+        'orders': row[1],
+        'revenue': row[2]
+    } for row in rows])
+
+@app.route('/api/reports/by-product')
+@login_required
+def report_by_product():
+    """Quantity and revenue per product, best sellers first"""
+    try:
+        start, end = report_date_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    quantity = func.sum(OrderItem.quantity)
+    revenue = func.sum(OrderItem.price * OrderItem.quantity)
+    order_key = quantity if request.args.get('sort') == 'quantity' else revenue
+    
+    rows = db.session.query(
+        Product.id,
+        Product.name,
+        Product.unit,
+        quantity,
+        revenue,
+        func.count(distinct(Order.id))
+    ).select_from(OrderItem).join(
+        Order, OrderItem.order_id == Order.id
+    ).join(
+        Product, OrderItem.product_id == Product.id
+    ).filter(report_range_condition(start, end)).group_by(
+        Product.id, Product.name, Product.unit
+    ).order_by(order_key.desc()).limit(report_limit()).all()
+    
+    return jsonify([{
+        'product_id': row[0],
+        'product': row[1],
+        'unit': row[2],
+        'quantity': int(row[3]),
+        'revenue': row[4],
+        'orders': row[5]
+    } for row in rows])
+
+@app.route('/api/reports/by-customer')
+@login_required
+def report_by_customer():
+    """Order count and revenue per customer, biggest buyers first"""
+    try:
+        start, end = report_date_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    revenue = func.sum(OrderItem.price * OrderItem.quantity)
+    rows = db.session.query(
+        Customer.id,
+        Customer.name,
+        func.count(distinct(Order.id)),
+        revenue
+    ).select_from(OrderItem).join(
+        Order, OrderItem.order_id == Order.id
+    ).join(
+        Customer, Order.customer_id == Customer.id
+    ).filter(report_range_condition(start, end)).group_by(
+        Customer.id, Customer.name
+    ).order_by(revenue.desc()).limit(report_limit()).all()
+    
+    return jsonify([{
+        'customer_id': row[0],
+        'customer': row[1],
+        'orders': row[2],
+        'revenue': row[3]
+    } for row in rows])
+
+@app.route('/api/reports/by-payment-status')
+@login_required
+def report_by_payment_status():
+    """Order count and order value per payment status"""
+    try:
+        start, end = report_date_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    rows = db.session.query(
+        Order.payment_status,
+        func.count(Order.id),
+        func.coalesce(func.sum(Order.total_amount), 0)
+    ).filter(report_range_condition(start, end)).group_by(Order.payment_status).all()
+    
+    return jsonify([{
+        'payment_status': row[0],
+        'orders': row[1],
+        'amount': row[2]
+    } for row in rows])
+
+@app.route('/api/reports/export-csv')
+@login_required
+def export_csv():
+    start, end = report_date_range()
+    chunk_size = app.config['EXPORT_CHUNK_SIZE']
+    
+    def generate():
+        # Rows are read through a server-side cursor and flushed to the client
+        # every chunk_size lines, so memory stays flat for any date range
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['Order ID', 'Date', 'Customer', 'Product', 'Quantity', 'Price', 'Total', 'Payment Status'])
+        
+        for count, line in enumerate(sales_lines_query(start, end).yield_per(chunk_size), 1):
             writer.writerow([
-                order.id,
-                order.order_date.strftime('%Y-%m-%d'),
-                order.customer.name,
-                item.product.name,
-                item.quantity,
-                float(item.price),
-                float(item.price) * item.quantity,
-                order.payment_status
+                line.order_id,
+                line.order_date.strftime('%Y-%m-%d'),
+                line.customer_name,
+                line.product_name,
+                line.quantity,
+                float(line.price),
+                float(line.price) * line.quantity,
+                line.payment_status
             ])
+            
+            if count % chunk_size == 0:
+                yield output.getvalue().encode('utf-8')
+                output.seek(0)
+                output.truncate(0)
+        
+        yield output.getvalue().encode('utf-8')
     
-    output.seek(0)
-    return send_file(
-        io.BytesIO(output.getvalue().encode('utf-8')),
+    filename = f'sales_report_{date.today().strftime("%Y%m%d")}.csv'
+    return Response(
+        stream_with_context(generate()),
         mimetype='text/csv',
-        as_attachment=True,
-        download_name=f'sales_report_{date.today().strftime("%Y%m%d")}.csv'
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
     )
 
 # Invoice Generation
-@app.route('/invoice/<int:order_id>')
-@login_required
-def generate_invoice(order_id):
-    order = Order.query.get_or_404(order_id)
+class InvoiceCache:
+    """Bounded two-level cache of rendered invoice PDFs.
     
-    # Create PDF
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    elements = []
+    Entries are keyed by order id and a version hash of everything printed on
+    the invoice, so any change to the order, its items, payments, products or
+    customer produces a new key and stale PDFs are never served. Recently used
+    PDFs are kept in memory; all of them are kept on disk so other workers and
+    restarts benefit. Both levels evict least recently used entries once their
+    byte budget is exceeded.
+    
+    The disk level is tracked in an in-memory index (file name -> order id and
+    size, in use order, plus a running byte total) that is read from the
+    directory once at startup, so puts, invalidations and evictions never list
+    or stat the whole directory. Each worker enforces the budget over the files
+    it knows about: those present at startup, written by it, or read by it.
+    """
+    
+    def __init__(self, directory, memory_bytes, disk_bytes):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._files = OrderedDict()
+        self._files_by_order = defaultdict(set)
+        self._disk_size = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load_index()
+    
+    def _name(self, order_id, version):
+        return f'{order_id}-{version}.pdf'
+    
+    def _path(self, order_id, version):
+        return os.path.join(self.directory, self._name(order_id, version))
+    
+    def _load_index(self):
+        """Index the files already on disk, least recently used first"""
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                order_id, _, rest = entry.name.partition('-')
+                if not entry.name.endswith('.pdf') or not order_id.isdigit() or not rest:
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, entry.name, int(order_id), stat.st_size))
+        
+        with self._lock:
+            for _, name, order_id, size in sorted(entries):
+                self._index_file(name, order_id, size)
+    
+    def _index_file(self, name, order_id, size):
+        # Callers hold self._lock
+        if name in self._files:
+            self._disk_size -= self._files[name][1]
+        self._files[name] = (order_id, size)
+        self._files.move_to_end(name)
+        self._files_by_order[order_id].add(name)
+        self._disk_size += size
+    
+    def _unindex_file(self, name):
+        # Callers hold self._lock
+        order_id, size = self._files.pop(name)
+        self._disk_size -= size
+        names = self._files_by_order[order_id]
+        names.discard(name)
+        if not names:
+            del self._files_by_order[order_id]
+    
+    def get(self, order_id, version):
+        key = (order_id, version)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        
+        if not self.directory:
+            return None
+        
+        path = self._path(order_id, version)
+        try:
+            with open(path, 'rb') as f:
+                pdf = f.read()
+            os.utime(path)  # Keeps use order across restarts
+        except OSError:
+            return None
+        
+        with self._lock:
+            # The file may have been written by another worker
+            self._index_file(self._name(order_id, version), order_id, len(pdf))
+        self._remember(key, pdf)
+        return pdf
+    
+    def put(self, order_id, version, pdf):
+        self.invalidate(order_id)
+        self._remember((order_id, version), pdf)
+        
+        if not self.directory:
+            return
+        
+        path = self._path(order_id, version)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(pdf)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not write invoice cache file: {e}")
+            return
+        
+        with self._lock:
+            self._index_file(self._name(order_id, version), order_id, len(pdf))
+            evicted = self._evict_disk()
+        self._remove_files(evicted)
+    
+    def invalidate(self, order_id):
+        """Drop every cached version of an order's invoice"""
+        self.invalidate_many([order_id])
+    
+    def invalidate_many(self, order_ids):
+        """Drop every cached version of the invoices of several orders"""
+        order_ids = set(order_ids)
+        with self._lock:
+            for key in [k for k in self._memory if k[0] in order_ids]:
+                self._memory_size -= len(self._memory.pop(key))
+            names = [name for order_id in order_ids for name in self._files_by_order.get(order_id, ())]
+            for name in names:
+                self._unindex_file(name)
+        self._remove_files(names)
+    
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+            self._files.clear()
+            self._files_by_order.clear()
+            self._disk_size = 0
+        
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith('.pdf'):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
     
-    # Styles
+    def _remember(self, key, pdf):
+        if len(pdf) > self.memory_bytes:
+            return
+        
+        with self._lock:
+            if key in self._memory:
+                self._memory_size -= len(self._memory.pop(key))
+            self._memory[key] = pdf
+            self._memory_size += len(pdf)
+            while self._memory_size > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_size -= len(evicted)
+    
+    def _evict_disk(self):
+        """Unindex least recently used files until the budget holds; returns their names"""
+        # Callers hold self._lock
+        evicted = []
+        while self._disk_size > self.disk_bytes and self._files:
+            name = next(iter(self._files))
+            self._unindex_file(name)
+            evicted.append(name)
+        return evicted
+    
+    def _remove_files(self, names):
+        for name in names:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+invoice_cache = InvoiceCache(
+    app.config['INVOICE_CACHE_DIR'] or os.path.join(app.instance_path, 'invoice_cache'),
+    app.config['INVOICE_CACHE_MEMORY_BYTES'],
+    app.config['INVOICE_CACHE_DISK_BYTES']
+)
+
+@db.event.listens_for(Order, 'after_delete')
+def drop_cached_invoice(mapper, connection, target):
+    invoice_cache.invalidate(target.id)
+
+def invoice_data(order):
+    """Plain snapshot of everything printed on an order's invoice.
+    
+    The snapshot holds no ORM state, so it can be hashed into a cache version
+    and shipped to render worker processes.
+    """
+    return {
+        'id': order.id,
+        'order_date': order.order_date,
+        'delivery_date': order.delivery_date,
+        'delivery_address': order.delivery_address,
+        'total_amount': order.total_amount,
+        'payment_status': order.payment_status,
+        'updated_at': order.updated_at,
+        'customer': {
+            'name': order.customer.name,
+            'address': order.customer.address,
+            'phone': order.customer.phone,
+            'updated_at': order.customer.updated_at
+        },
+        'items': [{
+            'id': item.id,
+            'product_name': item.product.name,
+            'product_updated_at': item.product.updated_at,
+            'quantity': item.quantity,
+            'price': item.price
+        } for item in order.items],
+        'payments': [(payment.id, payment.amount) for payment in order.payments]
+    }
+
+def invoice_version(data):
+    """Hash of an invoice snapshot, including the update stamps it carries"""
+    return hashlib.sha1(repr(data).encode('utf-8')).hexdigest()[:16]
+
+@lru_cache(maxsize=1)
+def invoice_styles():
+    """Paragraph and table styles shared by every invoice"""
     styles = getSampleStyleSheet()
     title_style = ParagraphStyle(
         'CustomTitle',
@@ -1912,81 +4249,436 @@ def generate_invoice(order_id):
         fontName='Helvetica-Bold'
     )
     
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        # Make the TOTAL row bold and give it a different background
+        ('FONTNAME', (2, -1), (3, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (2, -1), (3, -1), 12),
+        ('BACKGROUND', (2, -1), (3, -1), colors.lightblue),
+        ('TEXTCOLOR', (2, -1), (3, -1), colors.black)
+    ])
+    
+    return {
+        'normal': styles['Normal'],
+        'heading2': styles['Heading2'],
+        'title': title_style,
+        'bold': bold_style,
+        'table': table_style
+    }
+
+def render_invoice_pdf(invoice):
+    """Build the invoice PDF for an invoice_data snapshot and return its bytes"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    elements = []
+    styles = invoice_styles()
+    
     # Header
-    elements.append(Paragraph("BUILDING MATERIALS SHOP", title_style))
-    elements.append(Paragraph("123 Construction Street, City, Country", styles['Normal']))
-    elements.append(Paragraph("Phone: +1234567890 | Email: info@shop.com", styles['Normal']))
+    elements.append(Paragraph("BUILDING MATERIALS SHOP", styles['title']))
+    elements.append(Paragraph("123 Construction Street, City, Country", styles['normal']))
+    elements.append(Paragraph("Phone: +1234567890 | Email: info@shop.com", styles['normal']))
     elements.append(Spacer(1, 20))
     
     # Invoice details
-    elements.append(Paragraph(f"INVOICE #{order.id}", styles['Heading2']))
-    elements.append(Paragraph(f"Date: {order.order_date.strftime('%B %d, %Y')}", styles['Normal']))
-    elements.append(Paragraph(f"Customer: {order.customer.name}", styles['Normal']))
-    elements.append(Paragraph(f"Address: {order.customer.address}", styles['Normal']))
-    elements.append(Paragraph(f"Phone: {order.customer.phone}", styles['Normal']))
-    if order.delivery_address:
-        elements.append(Paragraph(f"Delivery Address: {order.delivery_address}", styles['Normal']))
-    if order.delivery_date:
-        elements.append(Paragraph(f"Delivery Date: {order.delivery_date.strftime('%B %d, %Y')}", styles['Normal']))
+    elements.append(Paragraph(f"INVOICE #{invoice['id']}", styles['heading2']))
+    elements.append(Paragraph(f"Date: {invoice['order_date'].strftime('%B %d, %Y')}", styles['normal']))
+    elements.append(Paragraph(f"Customer: {invoice['customer']['name']}", styles['normal']))
+    elements.append(Paragraph(f"Address: {invoice['customer']['address']}", styles['normal']))
+    elements.append(Paragraph(f"Phone: {invoice['customer']['phone']}", styles['normal']))
+    if invoice['delivery_address']:
+        elements.append(Paragraph(f"Delivery Address: {invoice['delivery_address']}", styles['normal']))
+    if invoice['delivery_date']:
+        elements.append(Paragraph(f"Delivery Date: {invoice['delivery_date'].strftime('%B %d, %Y')}", styles['normal']))
     
     elements.append(Spacer(1, 20))
     
     # Items table
     table_data = [['Product', 'Quantity', 'Unit Price', 'Total']]
-    for item in order.items:
+    for item in invoice['items']:
         table_data.append([
-            item.product.name,
-            str(item.quantity),
-            f"${float(item.price):.2f}",
-            f"${float(item.price) * item.quantity:.2f}"
+            item['product_name'],
+            str(item['quantity']),
+            f"${float(item['price']):.2f}",
+            f"${float(item['price']) * item['quantity']:.2f}"
         ])
     
     # Add total row
-    table_data.append(['', '', 'TOTAL', f"${float(order.total_amount):.2f}"])
+    table_data.append(['', '', 'TOTAL', f"${float(invoice['total_amount']):.2f}"])
     
     table = Table(table_data, colWidths=[3*inch, 1*inch, 1.5*inch, 1.5*inch])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        # Make the TOTAL row bold and give it a different background
-        ('FONTNAME', (2, -1), (3, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (2, -1), (3, -1), 12),
-        ('BACKGROUND', (2, -1), (3, -1), colors.lightblue),
-        ('TEXTCOLOR', (2, -1), (3, -1), colors.black)
-    ]))
+    table.setStyle(styles['table'])
     
     elements.append(table)
     elements.append(Spacer(1, 20))
     
     # Payment status
-    elements.append(Paragraph(f"Payment Status: {order.payment_status}", styles['Normal']))
+    elements.append(Paragraph(f"Payment Status: {invoice['payment_status']}", styles['normal']))
     
     # Build PDF
     doc.build(elements)
-    buffer.seek(0)
+    return buffer.getvalue()
+
+def cached_invoice_pdf(order):
+    """Return the invoice PDF for an order, rendering it only when it changed"""
+    data = invoice_data(order)
+    version = invoice_version(data)
+    pdf = invoice_cache.get(order.id, version)
+    if pdf is None:
+        pdf, seconds = timed_render_invoice_pdf(data)
+        request_metrics.observe_invoice('single', seconds)
+        invoice_cache.put(order.id, version, pdf)
+    return pdf
+
+def timed_render_invoice_pdf(invoice):
+    """Render an invoice and report how long it took (also run in pool workers)"""
+    started = time.perf_counter()
+    pdf = render_invoice_pdf(invoice)
+    return pdf, time.perf_counter() - started
+
+@app.route('/invoice/<int:order_id>')
+@login_required
+def generate_invoice(order_id):
+    order = order_invoice_query().filter(Order.id == order_id).first_or_404()
     
     return send_file(
-        buffer,
+        io.BytesIO(cached_invoice_pdf(order)),
         mimetype='application/pdf',
         as_attachment=True,
         download_name=f'invoice_{order.id}.pdf'
     )
 
+# Bulk invoice generation
+# Jobs live in this process only; the download and progress requests for a
+# job must reach the worker that created it.
+bulk_invoice_jobs = {}
+bulk_invoice_jobs_lock = threading.Lock()
+_invoice_pool = None
+_invoice_pool_lock = threading.Lock()
+
+def get_invoice_pool():
+    """Process pool of ReportLab render workers, created on first use"""
+    global _invoice_pool
+    with _invoice_pool_lock:
+        if _invoice_pool is None:
+            _invoice_pool = ProcessPoolExecutor(max_workers=app.config['BULK_INVOICE_WORKERS'])
+        return _invoice_pool
+
+class ZipStream:
+    """Write-only file object that hands zipfile output back in pieces"""
+    
+    def __init__(self):
+        self._chunks = []
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+@app.route('/api/invoices/bulk', methods=['POST'])
+@login_required
+def create_bulk_invoice_job():
+    """Select orders by id list, customer and/or date range for a ZIP download"""
+    data = request.get_json() or {}
+    query = db.session.query(Order.id)
+    
+    try:
+        if data.get('order_ids'):
+            query = query.filter(Order.id.in_([int(order_id) for order_id in data['order_ids']]))
+        if data.get('customer_id'):
+            query = query.filter(Order.customer_id == int(data['customer_id']))
+        if data.get('start_date'):
+            query = query.filter(Order.order_date >= datetime.strptime(data['start_date'], '%Y-%m-%d').date())
+        if data.get('end_date'):
+            query = query.filter(Order.order_date <= datetime.strptime(data['end_date'], '%Y-%m-%d').date())
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid selection: {e}'}), 400
+    
+    if not any(data.get(key) for key in ['order_ids', 'customer_id', 'start_date', 'end_date']):
+        return jsonify({'error': 'Select orders by order_ids, customer_id or a date range'}), 400
+    
+    order_ids = [row.id for row in query.order_by(Order.id).all()]
+    if not order_ids:
+        return jsonify({'error': 'No orders match the selection'}), 404
+    if len(order_ids) > app.config['BULK_INVOICE_MAX_ORDERS']:
+        return jsonify({'error': f"Too many orders ({len(order_ids)}); the limit is {app.config['BULK_INVOICE_MAX_ORDERS']}"}), 400
+    
+    job_id = uuid.uuid4().hex
+    with bulk_invoice_jobs_lock:
+        # Forget jobs older than an hour
+        cutoff = time.time() - 3600
+        for stale_id in [k for k, job in bulk_invoice_jobs.items() if job['created_at'] < cutoff]:
+            del bulk_invoice_jobs[stale_id]
+        
+        bulk_invoice_jobs[job_id] = {
+            'order_ids': order_ids,
+            'total': len(order_ids),
+            'done': 0,
+            'status': 'pending',
+            'created_at': time.time()
+        }
+    
+    return jsonify({
+        'job_id': job_id,
+        'total': len(order_ids),
+        'progress_url': url_for('bulk_invoice_progress', job_id=job_id),
+        'download_url': url_for('download_bulk_invoices', job_id=job_id)
+    })
+
+@app.route('/api/invoices/bulk/<job_id>')
+@login_required
+def bulk_invoice_progress(job_id):
+    job = bulk_invoice_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify({
+        'job_id': job_id,
+        'status': job['status'],
+        'total': job['total'],
+        'done': job['done']
+    })
+
+@app.route('/api/invoices/bulk/<job_id>/download')
+@login_required
+def download_bulk_invoices(job_id):
+    """Stream a ZIP of invoices, adding each PDF as soon as it is rendered"""
+    with bulk_invoice_jobs_lock:
+        job = bulk_invoice_jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        # A download that was cancelled or failed can be started again
+        if job['status'] not in ('pending', 'cancelled', 'failed'):
+            return jsonify({'error': f"Job is {job['status']}"}), 409
+        job['status'] = 'running'
+        job['done'] = 0
+    
+    batch_size = app.config['BULK_INVOICE_BATCH_SIZE']
+    
+    def generate():
+        stream = ZipStream()
+        archive = zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED)
+        
+        def add(order_id, pdf):
+            archive.writestr(f'invoice_{order_id}.pdf', pdf)
+            job['done'] += 1
+            return stream.drain()
+        
+        futures = {}
+        try:
+            order_ids = job['order_ids']
+            for offset in range(0, len(order_ids), batch_size):
+                batch = order_ids[offset:offset + batch_size]
+                orders = order_invoice_query().filter(Order.id.in_(batch)).all()
+                
+                # Cached PDFs go out immediately; the rest render in parallel
+                futures = {}
+                for order in orders:
+                    data = invoice_data(order)
+                    version = invoice_version(data)
+                    pdf = invoice_cache.get(order.id, version)
+                    if pdf is not None:
+                        yield add(order.id, pdf)
+                    else:
+                        futures[get_invoice_pool().submit(timed_render_invoice_pdf, data)] = (order.id, version)
+                
+                for future in as_completed(futures):
+                    order_id, version = futures[future]
+                    pdf, seconds = future.result()
+                    request_metrics.observe_invoice('bulk', seconds)
+                    invoice_cache.put(order_id, version, pdf)
+                    yield add(order_id, pdf)
+                
+                # Orders deleted since the job was created are skipped
+                job['done'] += len(batch) - len(orders)
+            
+            archive.close()
+            yield stream.drain()
+            job['status'] = 'finished'
+        except GeneratorExit:
+            # The client went away mid-download
+            job['status'] = 'cancelled'
+            raise
+        except Exception:
+            job['status'] = 'failed'
+            raise
+        finally:
+            # Renders nobody will download again are not worth finishing
+            for future in futures:
+                future.cancel()
+    
+    response = Response(
+        stream_with_context(generate()),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename=invoices_{date.today().strftime("%Y%m%d")}.zip'}
+    )
+    
+    @response.call_on_close
+    def release_job():
+        # Covers a client that disconnects before the first chunk, when the
+        # generator never started and so never saw GeneratorExit
+        if job['status'] == 'running':
+            job['status'] = 'cancelled'
+    
+    return response
+
 # Search functionality
+def trigrams(text):
+    """Word trigrams padded like pg_trgm, so short queries match word starts"""
+    grams = set()
+    for word in (text or '').lower().split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+class TrigramIndex:
+    """In-process trigram index over a few text columns of one model.
+    
+    Lookups only touch the posting lists of the query's trigrams, so they do
+    not scan the table. The index is built on first use, kept current by ORM
+    events in this process and refreshed from updated_at every
+    SEARCH_INDEX_REFRESH_SECONDS to pick up writes made by other workers.
+    Matching ids are always re-read from the database, so rows deleted
+    elsewhere simply drop out of the results.
+    """
+    
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields
+        self._lock = threading.RLock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self._documents = {}
+            self._postings = defaultdict(set)
+            self._built = False
+            self._watermark = None
+            self._refreshed_at = 0
+    
+    def _text(self, values):
+        return ' '.join(str(value) for value in values if value).lower()
+    
+    def add(self, row_id, values):
+        with self._lock:
+            if not self._built:
+                return
+            self._discard(row_id)
+            text = self._text(values)
+            self._documents[row_id] = text
+            for gram in trigrams(text):
+                self._postings[gram].add(row_id)
+    
+    def remove(self, row_id):
+        with self._lock:
+            self._discard(row_id)
+    
+    def _discard(self, row_id):
+        text = self._documents.pop(row_id, None)
+        if text is None:
+            return
+        for gram in trigrams(text):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(row_id)
+                if not ids:
+                    del self._postings[gram]
+    
+    def _load(self):
+        """Index rows changed since the last load (everything on first use)"""
+        columns = [getattr(self.model, field) for field in self.fields]
+        query = db.session.query(self.model.id, self.model.updated_at, *columns)
+        if self._watermark is not None:
+            query = query.filter(self.model.updated_at >= self._watermark)
+        
+        self._built = True
+        for row in query.yield_per(1000):
+            self.add(row[0], row[2:])
+            if row[1] is not None and (self._watermark is None or row[1] > self._watermark):
+                self._watermark = row[1]
+        self._refreshed_at = time.time()
+    
+    def search(self, text, limit):
+        """Ids of the best matching rows, best first"""
+        grams = trigrams(text)
+        if not grams:
+            return []
+        
+        needle = ' '.join(text.lower().split())
+        min_similarity = app.config['SEARCH_MIN_SIMILARITY']
+        # A row containing the query as a substring holds at least all of its
+        # unpadded trigrams, however few padded ones it matches; such rows are
+        # kept even below the similarity cut (short mid-word queries like part
+        # of a phone number score under it)
+        inner_grams = sum(1 for gram in grams if ' ' not in gram)
+        
+        with self._lock:
+            if not self._built or time.time() - self._refreshed_at > app.config['SEARCH_INDEX_REFRESH_SECONDS']:
+                self._load()
+            
+            counts = Counter()
+            for gram in grams:
+                counts.update(self._postings.get(gram, ()))
+            
+            scored = []
+            for row_id, matches in counts.items():
+                similarity = matches / len(grams)
+                if similarity < min_similarity and matches < inner_grams:
+                    continue
+                document = self._documents[row_id]
+                contains = needle in document
+                if contains or similarity >= min_similarity:
+                    scored.append((contains, similarity, -len(document), row_id))
+        
+        return [row[-1] for row in heapq.nlargest(limit, scored)]
+
+customer_search_index = TrigramIndex(Customer, ['name', 'phone', 'address'])
+product_search_index = TrigramIndex(Product, ['name', 'unit'])
+
+def _index_customer(mapper, connection, target):
+    customer_search_index.add(target.id, [target.name, target.phone, target.address])
+
+def _index_product(mapper, connection, target):
+    product_search_index.add(target.id, [target.name, target.unit])
+
+db.event.listen(Customer, 'after_insert', _index_customer)
+db.event.listen(Customer, 'after_update', _index_customer)
+db.event.listen(Customer, 'after_delete', lambda mapper, connection, target: customer_search_index.remove(target.id))
+db.event.listen(Product, 'after_insert', _index_product)
+db.event.listen(Product, 'after_update', _index_product)
+db.event.listen(Product, 'after_delete', lambda mapper, connection, target: product_search_index.remove(target.id))
+
+def fetch_ranked(query, model, ids):
+    """Load rows by id and return them in the given rank order"""
+    if not ids:
+        return []
+    rows = {row.id: row for row in query.filter(model.id.in_(ids)).all()}
+    return [rows[row_id] for row_id in ids if row_id in rows]
+
 @app.route('/api/search')
 @login_required
 def search():
-    query = request.args.get('q', '')
+    query = request.args.get('q', '').strip()
     search_type = request.args.get('type', 'orders')
+    limit = request.args.get('limit', app.config['ITEMS_PER_PAGE'], type=int)
+    limit = max(1, min(limit, app.config['MAX_ITEMS_PER_PAGE']))
     
     if search_type == 'customers':
-        results = Customer.query.filter(Customer.name.ilike(f'%{query}%')).all()
+        ids = customer_search_index.search(query, limit)
+        results = fetch_ranked(Customer.query, Customer, ids)
         return jsonify([{
             'id': c.id,
             'name': c.name,
@@ -1995,23 +4687,48 @@ def search():
         } for c in results])
     
     elif search_type == 'products':
-        results = Product.query.filter(Product.name.ilike(f'%{query}%')).all()
+        ids = product_search_index.search(query, limit)
+        results = fetch_ranked(Product.query, Product, ids)
         return jsonify([{
             'id': p.id,
             'name': p.name,
-            'price': float(p.price),
+            'price': p.price,
             'stock_quantity': p.stock_quantity
         } for p in results])
     
     else:  # orders
-        results = Order.query.join(Customer).filter(Customer.name.ilike(f'%{query}%')).all()
+        results = []
+        
+        # An order number matches exactly and ranks first
+        if query.lstrip('#').isdigit():
+            results = fetch_ranked(order_customer_query(), Order, [int(query.lstrip('#'))])
+        
+        # Then the latest orders of each matching customer, best match first.
+        # Orders are numbered per customer along ix_orders_customer_id, so a
+        # well ranked customer with only old orders is never crowded out
+        customer_ids = customer_search_index.search(query, limit)
+        if customer_ids:
+            rank = {customer_id: i for i, customer_id in enumerate(customer_ids)}
+            latest = db.session.query(
+                Order.id.label('order_id'),
+                func.row_number().over(
+                    partition_by=Order.customer_id,
+                    order_by=(Order.order_date.desc(), Order.id.desc())
+                ).label('position')
+            ).filter(Order.customer_id.in_(customer_ids)).subquery()
+            rows = order_customer_query().join(
+                latest, latest.c.order_id == Order.id
+            ).filter(latest.c.position <= limit).add_columns(latest.c.position).all()
+            rows.sort(key=lambda row: (rank[row[0].customer_id], row.position))
+            results += [o for o, _ in rows if not results or o.id != results[0].id]
+        
         return jsonify([{
             'id': o.id,
             'customer_name': o.customer.name,
-            'order_date': o.order_date.strftime('%Y-%m-%d'),
-            'total_amount': float(o.total_amount),
+            'order_date': o.order_date,
+            'total_amount': o.total_amount,
             'payment_status': o.payment_status
-        } for o in results])
+        } for o in results[:limit]])
 
 # Database recreation route (for development/testing)
 @app.route('/recreate-db')
@@ -2026,6 +4743,11 @@ def recreate_database():
         db.drop_all()
         # Create all tables
         db.create_all()
+        apply_migrations(db.engine)
+        customer_search_index.reset()
+        product_search_index.reset()
+        user_cache.clear()
+        invoice_cache.clear()
         
         # Create default admin user and sample data
         create_default_admin()
@@ -2035,6 +4757,38 @@ def recreate_database():
     except Exception as e:
         return jsonify({'error': f'Failed to recreate database: {str(e)}'}), 500
 
+# Connection pool status route
+@app.route('/api/system/pool')
+@login_required
+def pool_status():
+    """Live connection pool usage for sizing pool_size and max_overflow"""
+    return jsonify(pool_metrics.snapshot(db.engine.pool))
+
+# Schema migration routes
+@app.route('/migrate', methods=['GET', 'POST'])
+@login_required
+def migrate_database():
+    """List schema migrations (GET) or apply the pending ones (POST)"""
+    try:
+        if request.method == 'POST':
+            applied = apply_migrations(db.engine)
+            return jsonify({'applied': applied, 'migrations': migration_status(db.engine)})
+        return jsonify({'migrations': migration_status(db.engine)})
+    except Exception as e:
+        return jsonify({'error': f'Failed to apply migrations: {str(e)}'}), 500
+
+# Order balance repair route
+@app.route('/repair-balances', methods=['POST'])
+@login_required
+def repair_balances_route():
+    """Recompute every order's paid_amount and balance_due from its payments"""
+    try:
+        repaired = repair_order_balances()
+        return jsonify({'message': f'Order balances repaired ({repaired} order(s) corrected)', 'repaired': repaired})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to repair order balances: {str(e)}'}), 500
+
 # Insert sample data route
 @app.route('/insert-sample-data')
 @login_required
@@ -2082,6 +4836,8 @@ if __name__ == '__main__':
     with app.app_context():
         create_database_if_not_exists()
         db.create_all()
+        apply_migrations(db.engine)
         create_default_admin()
         insert_sample_data()
+    asset_manifest = build_assets(verbose=False)
     app.run(debug=True, host='0.0.0.0', port=5000)
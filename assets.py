@@ -0,0 +1,176 @@
+"""Static asset build.
+
+Copies the stylesheets, scripts and fonts under static/ into static/dist/
+with a content hash in each file name, rewrites url() references in the CSS
+to the hashed names, writes gzip (and, when the brotli package is installed,
+brotli) compressed copies of text files next to them and records the mapping
+in static/dist/manifest.json. app.py serves the dist files under /assets/
+with far-future cache headers, choosing the precompressed copy the browser
+accepts, and templates refer to them through asset_url().
+
+Bootstrap, jQuery, Font Awesome and the Inter font are served from
+static/vendor/ once they have been downloaded with --fetch-vendor. Until
+then asset_url() points at the public CDNs they came from (css/fonts.css
+lists the CDN copy of Inter as a second source), so pages work either way.
+
+Usage:
+    python assets.py                 # rebuild static/dist
+    python assets.py --fetch-vendor  # download vendor files, then rebuild
+
+app.py rebuilds static/dist when started with python app.py.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+import sys
+import urllib.request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_NAME = 'manifest.json'
+
+# Local path under static/ -> upstream URL, pinned to the versions the
+# templates were written against
+VENDOR_ASSETS = {
+    'vendor/bootstrap/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css',
+    'vendor/bootstrap/bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/js/bootstrap.bundle.min.js',
+    'vendor/jquery/jquery.min.js': 'https://code.jquery.com/jquery-3.7.1.min.js',
+    'vendor/fontawesome/css/all.min.css': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css',
+}
+# Fonts referenced by the Font Awesome stylesheet
+for _font in ('fa-brands-400', 'fa-regular-400', 'fa-solid-900', 'fa-v4compatibility'):
+    for _ext in ('woff2', 'ttf'):
+        VENDOR_ASSETS[f'vendor/fontawesome/webfonts/{_font}.{_ext}'] = \
+            f'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/{_font}.{_ext}'
+# Inter (variable weight) for css/fonts.css, Latin subsets only
+for _subset in ('latin', 'latin-ext'):
+    VENDOR_ASSETS[f'vendor/inter/inter-{_subset}-wght-normal.woff2'] = \
+        f'https://cdn.jsdelivr.net/npm/@fontsource-variable/inter@5.0.16/files/inter-{_subset}-wght-normal.woff2'
+
+ASSET_EXTENSIONS = {'.css', '.js', '.woff2', '.woff', '.ttf', '.svg', '.png', '.ico'}
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.ttf'}
+CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+def fetch_vendor(force=False):
+    """Download the vendor files that are not present yet"""
+    for path, url in VENDOR_ASSETS.items():
+        target = os.path.join(STATIC_DIR, *path.split('/'))
+        if os.path.exists(target) and not force:
+            continue
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                data = response.read()
+        except OSError as e:
+            print(f"⚠️ Could not download {path}: {e}")
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(data)
+        print(f"✓ Downloaded {path} ({len(data):,} bytes)")
+
+def source_files():
+    """Paths under static/ (posix style) of every asset to build, dist excluded"""
+    paths = []
+    for root, dirs, files in os.walk(STATIC_DIR):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != DIST_DIR]
+        for name in files:
+            if os.path.splitext(name)[1] in ASSET_EXTENSIONS:
+                paths.append(os.path.relpath(os.path.join(root, name), STATIC_DIR).replace(os.sep, '/'))
+    # Stylesheets last, so the files their url()s point at already have names
+    return sorted(paths, key=lambda p: (p.endswith('.css'), p))
+
+def hashed_name(path, data):
+    base, ext = posixpath.splitext(path)
+    return f'{base}.{hashlib.sha256(data).hexdigest()[:10]}{ext}'
+
+def rewrite_css_urls(path, text, manifest):
+    """Point relative url()s at the hashed names of the files they reference"""
+    directory = posixpath.dirname(path)
+
+    def replace(match):
+        url = match.group(2)
+        if re.match(r'^(?:[a-z]+:|/|#)', url):
+            return match.group(0)
+        target = re.split(r'[?#]', url)[0]
+        resolved = posixpath.normpath(posixpath.join(directory, target))
+        if resolved not in manifest:
+            return match.group(0)
+        # Query strings (cache busters) are dropped; fragments (SVG ids) kept
+        fragment = url[len(target):].partition('#')[2]
+        new = posixpath.relpath(manifest[resolved], directory)
+        return f'url({new}{"#" + fragment if fragment else ""})'
+
+    return CSS_URL.sub(replace, text)
+
+def build(verbose=True):
+    """Rebuild static/dist and return the manifest"""
+    manifest = {}
+    staging = DIST_DIR + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+
+    for path in source_files():
+        with open(os.path.join(STATIC_DIR, *path.split('/')), 'rb') as f:
+            data = f.read()
+        ext = posixpath.splitext(path)[1]
+        if ext == '.css':
+            data = rewrite_css_urls(path, data.decode('utf-8'), manifest).encode('utf-8')
+
+        name = hashed_name(path, data)
+        manifest[path] = name
+        target = os.path.join(staging, *name.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(data)
+
+        if ext in COMPRESSIBLE_EXTENSIONS:
+            with open(target + '.gz', 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                with open(target + '.br', 'wb') as f:
+                    f.write(brotli.compress(data, quality=11))
+        if verbose:
+            print(f"  {path} -> {name}")
+
+    os.makedirs(staging, exist_ok=True)
+    with open(os.path.join(staging, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    os.replace(staging, DIST_DIR)
+    return manifest
+
+def load_manifest():
+    """Read static/dist/manifest.json, or return {} if assets were never built"""
+    try:
+        with open(os.path.join(DIST_DIR, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fetch-vendor', action='store_true', help='download Bootstrap, jQuery, Font Awesome and Inter first')
+    parser.add_argument('--force', action='store_true', help='with --fetch-vendor, download files that already exist')
+    args = parser.parse_args()
+
+    if args.fetch_vendor:
+        fetch_vendor(args.force)
+    manifest = build()
+    missing = [path for path in VENDOR_ASSETS if path not in manifest]
+    print(f"✓ Built {len(manifest)} asset(s) into {DIST_DIR}" + (' with brotli' if brotli else ' (gzip only; pip install brotli for .br files)'))
+    if missing:
+        print(f"⚠️ {len(missing)} vendor file(s) not downloaded; pages load them from the CDN (run with --fetch-vendor)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Route latency benchmark.
+
+Seeds a SQLite database with a fixed number of orders (generate_data.py),
+then requests each benchmarked route through the Flask test client and
+reports latency percentiles, throughput, SQL statements per request, response size and the
+peak Python memory of one request, as JSON. Runs are deterministic for a
+given --seed, so results from two commits can be compared with --compare.
+
+Usage:
+    python benchmark.py                              # 1k orders, temporary database
+    python benchmark.py --scale 100k --output before.json
+    python benchmark.py --scale 100k --database bench.db --compare before.json
+
+--database keeps the seeded file, and later runs with the same scale reuse
+it instead of seeding again. Everything runs in-process against SQLite;
+no server or external service is needed.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+SCALES = {'1k': 1000, '100k': 100000, '1m': 1000000}
+
+# Route name -> URL; {order_id} and {term} are filled per request so caches
+# (invoice PDFs, search results) do not turn every request into a hit
+ROUTES = {
+    'dashboard': '/api/dashboard/summary',
+    'dashboard_page': '/',
+    'api_orders': '/api/orders',
+    'api_payments': '/api/payments',
+    'sales_report': '/api/reports/sales',
+    'export_csv': '/api/reports/export-csv',
+    'generate_invoice': '/invoice/{order_id}',
+    'search': '/api/search?q={term}',
+}
+
+SEARCH_TERMS = ['sharma', 'kumar', 'builders', 'road', 'khan', 'traders', 'lucknow', 'nagar']
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', choices=sorted(SCALES), default='1k', help='orders to seed')
+    parser.add_argument('--orders', type=int, help='seed this many orders instead of a preset scale')
+    parser.add_argument('--requests', type=int, default=30, help='timed requests per route')
+    parser.add_argument('--warmup', type=int, default=3, help='untimed requests per route')
+    parser.add_argument('--routes', help='comma-separated subset of: ' + ', '.join(ROUTES))
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--database', help='SQLite file to seed or reuse (default: temporary file)')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    parser.add_argument('--compare', help='earlier JSON result to print p95 changes against')
+    args = parser.parse_args()
+
+    order_count = args.orders or SCALES[args.scale]
+    routes = args.routes.split(',') if args.routes else list(ROUTES)
+    unknown = [name for name in routes if name not in ROUTES]
+    if unknown:
+        parser.error(f"unknown route(s): {', '.join(unknown)}")
+
+    workdir = None
+    database = args.database
+    if not database:
+        workdir = tempfile.mkdtemp()
+        database = os.path.join(workdir, 'benchmark.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.abspath(database)
+    os.environ.setdefault('FLASK_ENV', 'production')
+    os.environ['METRICS_ENABLED'] = 'false'
+
+    # Imported after DATABASE_URL is set so the app binds to the benchmark database
+    from sqlalchemy import event
+    from app import app, db, Order, create_default_admin
+    from migrations import apply_migrations
+    from generate_data import generate_data
+
+    # Setup messages go to stderr so stdout carries only the JSON report
+    with app.app_context(), contextlib.redirect_stdout(sys.stderr):
+        db.create_all()
+        apply_migrations(db.engine)
+        create_default_admin()
+        existing = db.session.query(db.func.count(Order.id)).scalar()
+        seed_seconds = None
+        if existing not in (0, order_count):
+            raise SystemExit(f"{database} holds {existing} orders, not {order_count}; use another --database")
+        if existing == 0:
+            print(f"Seeding {order_count} orders...", file=sys.stderr)
+            seed_seconds = generate_data(db, orders=order_count, seed=args.seed)['seconds']
+
+    statements = [0]
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements[0] += 1
+
+    rng = random.Random(args.seed)
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+
+    def request_once(name):
+        url = ROUTES[name].format(order_id=rng.randint(1, order_count), term=rng.choice(SEARCH_TERMS))
+        response = client.get(url)
+        # Reading the body runs streamed responses (the CSV export) to the end
+        size = len(response.get_data())
+        response.close()
+        return response.status_code, size
+
+    # Requests must run without an outer app context, or they would share one
+    # session (and its identity map) instead of starting fresh like in production
+    with app.app_context():
+        engine = db.engine
+
+    results = {}
+    event.listen(engine, 'before_cursor_execute', count_statement)
+    try:
+        for name in routes:
+            print(f"Benchmarking {name}...", file=sys.stderr)
+            for _ in range(args.warmup):
+                request_once(name)
+
+            timings, statuses, sizes = [], {}, []
+            statements[0] = 0
+            started = time.perf_counter()
+            for _ in range(args.requests):
+                request_started = time.perf_counter()
+                status, size = request_once(name)
+                timings.append(time.perf_counter() - request_started)
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+                sizes.append(size)
+            elapsed = time.perf_counter() - started
+            query_count = statements[0]
+
+            # Memory is measured on a separate request; tracing slows the timed ones
+            tracemalloc.start()
+            request_once(name)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            timings.sort()
+            results[name] = {
+                'url': ROUTES[name],
+                'requests': args.requests,
+                'status_codes': statuses,
+                'p50_ms': round(percentile(timings, 0.50) * 1000, 3),
+                'p95_ms': round(percentile(timings, 0.95) * 1000, 3),
+                'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+                'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+                'throughput_rps': round(args.requests / elapsed, 2),
+                'queries_per_request': round(query_count / args.requests, 2),
+                'response_bytes_avg': round(sum(sizes) / len(sizes)),
+                'peak_memory_kb': round(peak / 1024, 1),
+            }
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_statement)
+        engine.dispose()
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'orders': order_count,
+            'seed': args.seed,
+            'requests_per_route': args.requests,
+            'seed_seconds': seed_seconds,
+        },
+        'routes': results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['routes']
+        print(f"\n{'route':<18}{'p95 before':>12}{'p95 now':>12}{'change':>10}", file=sys.stderr)
+        for name, result in results.items():
+            if name in baseline:
+                before, now = baseline[name]['p95_ms'], result['p95_ms']
+                change = f'{(now - before) / before * 100:+.1f}%' if before else 'n/a'
+                print(f"{name:<18}{before:>12.2f}{now:>12.2f}{change:>10}", file=sys.stderr)
+
+    if workdir:
+        os.remove(database)
+        os.rmdir(workdir)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,6 +8,17 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Database connection pool, per worker process. Keep
+    # workers * (pool_size + max_overflow) below MySQL's max_connections and
+    # pool_recycle below its wait_timeout (or any proxy idle timeout).
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 280)),
+        'pool_pre_ping': True
+    }
+    
     # Session configuration
     PERMANENT_SESSION_LIFETIME = timedelta(hours=8)
     
@@ -16,21 +27,91 @@ class Config:
     
     # Pagination
     ITEMS_PER_PAGE = 20
+    MAX_ITEMS_PER_PAGE = 100
+    
+    # Reports
+    EXPORT_CHUNK_SIZE = 1000
+    
+    # Order balances (rows per transaction when repairing paid_amount/balance_due)
+    BALANCE_REPAIR_CHUNK_SIZE = 5000
+    
+    # Bulk order import
+    IMPORT_MAX_ORDERS = 10000
+    
+    # Bulk product updates (product ids per UPDATE statement)
+    BULK_UPDATE_CHUNK_SIZE = 500
+    
+    # Customer and product deletes (orders or order items removed per transaction)
+    CASCADE_DELETE_CHUNK_SIZE = 1000
+    
+    # Invoice PDF cache (directory defaults to <instance>/invoice_cache)
+    INVOICE_CACHE_DIR = os.environ.get('INVOICE_CACHE_DIR')
+    INVOICE_CACHE_MEMORY_BYTES = 32 * 1024 * 1024
+    INVOICE_CACHE_DISK_BYTES = 256 * 1024 * 1024
+    
+    # Bulk invoice ZIP downloads (workers default to the CPU count)
+    BULK_INVOICE_WORKERS = None
+    BULK_INVOICE_BATCH_SIZE = 100
+    BULK_INVOICE_MAX_ORDERS = 5000
+    
+    # Search
+    SEARCH_INDEX_REFRESH_SECONDS = 30
+    SEARCH_MIN_SIMILARITY = 0.5
+    
+    # Logged-in users cached per worker (changes made by other workers show up within the TTL)
+    USER_CACHE_TTL_SECONDS = 300
+    USER_CACHE_MAX_ENTRIES = 1000
+    
+    # Response compression (gzip, or brotli when the brotli package is installed)
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4))
+    COMPRESS_MIMETYPES = ['application/json', 'text/html', 'text/csv', 'text/plain', 'text/css',
+                          'text/javascript', 'application/javascript', 'application/x-ndjson']
+    
+    # Dashboard live updates (server-sent events). Every open stream holds a
+    # worker thread, so streams need a threaded or gevent worker class
+    # (gunicorn -k gthread or -k gevent). With sync workers set
+    # DASHBOARD_STREAM_ENABLED=false and dashboards poll instead.
+    DASHBOARD_STREAM_ENABLED = os.environ.get('DASHBOARD_STREAM_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    DASHBOARD_STREAM_KEEPALIVE_SECONDS = 15
+    DASHBOARD_STREAM_DEBOUNCE_SECONDS = 0.5
+    DASHBOARD_STREAM_CHECK_SECONDS = 5
+    DASHBOARD_STREAM_MAX_SECONDS = 300
+    DASHBOARD_STREAM_MAX_CLIENTS = int(os.environ.get('DASHBOARD_STREAM_MAX_CLIENTS', 100))
+    
+    # Request metrics on /metrics (Prometheus text format). When disabled no
+    # hooks are installed; METRICS_TOKEN, if set, must be sent as a bearer token.
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     SQLALCHEMY_ECHO = True
+    SQLALCHEMY_ENGINE_OPTIONS = dict(
+        Config.SQLALCHEMY_ENGINE_OPTIONS,
+        pool_size=int(os.environ.get('DB_POOL_SIZE', 2)),
+        max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 5))
+    )
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     SQLALCHEMY_ECHO = False
+    SQLALCHEMY_ENGINE_OPTIONS = dict(
+        Config.SQLALCHEMY_ENGINE_OPTIONS,
+        pool_size=int(os.environ.get('DB_POOL_SIZE', 10)),
+        max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    )
 
 class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # In-memory SQLite runs on a single static connection
+    SQLALCHEMY_ENGINE_OPTIONS = {}
 
 # Configuration dictionary
 config = {
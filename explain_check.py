@@ -0,0 +1,213 @@
+"""Flag route queries that scan a whole table.
+
+Requests every read-only route through the Flask test client, captures the
+SELECT statements each one issues and runs them through EXPLAIN (MySQL) or
+EXPLAIN QUERY PLAN (SQLite). A query is reported when the plan reads a
+large table without using an index. A scan is listed as bounded rather
+than failing only when its statement has a LIMIT, the scan already follows
+the ORDER BY and no condition filters the scanned rows, so a keyset page
+stops after one page. Accepted scans are listed in EXPECTED_SCANS with the
+reason.
+
+Usage:
+    python explain_check.py            # check the configured database
+    python explain_check.py --seed 50  # add 50 orders first (test databases only)
+
+Exits with status 1 when an unexpected full scan is found.
+"""
+import argparse
+import re
+import sys
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app import app, db, Order, create_default_admin, insert_sample_data
+from migrations import apply_migrations
+
+# Tables that grow with the business; scans of anything else are ignored
+CHECKED_TABLES = {'customers', 'products', 'orders', 'order_items', 'payments'}
+
+# Scans that are accepted, with the reason: the route returns or totals the
+# whole table, or the scan is a known cost listed here so it is not mistaken
+# for a bounded page
+EXPECTED_SCANS = {
+    '/api/dashboard/summary': {
+        'customers': 'counts every customer',
+        'products': 'counts every product',
+    },
+    '/customers': {'customers': 'counts every customer for the page total'},
+    '/api/customers?q=abc': {'customers': "leading-wildcard ILIKE on name, phone and address cannot use an index; /api/search is the indexed lookup"},
+    '/products': {'products': 'lists every product'},
+    '/api/products': {'products': 'lists every product'},
+    '/orders': {
+        'customers': 'fills the customer picker',
+        'products': 'fills the product picker',
+    },
+    '/api/reports/by-customer': {'customers': 'groups by customer, probing ix_orders_customer_id once per customer'},
+    '/api/reports/by-payment-status': {'orders': 'groups by status along ix_orders_status_date, filtering dates within each status'},
+    '/api/search?q=cement': {
+        'customers': 'builds the in-process trigram index on first use',
+        'products': 'builds the in-process trigram index on first use',
+    },
+}
+
+ROUTES = [
+    '/',
+    '/api/dashboard/summary',
+    '/api/dashboard/pending-deliveries',
+    '/customers',
+    '/api/customers',
+    '/api/customers?sort=name',
+    '/api/customers?q=abc',
+    '/products',
+    '/api/products',
+    '/orders',
+    '/api/orders',
+    '/api/orders?status=Unpaid,Partial',
+    '/api/orders?outstanding=1',
+    '/api/orders?sort=-order_date',
+    '/api/orders?start_date={month_start}&end_date={today}',
+    '/api/orders?customer_id={customer_id}',
+    '/api/orders/{order_id}',
+    '/payments',
+    '/api/payments',
+    '/api/payments?order_id={order_id}',
+    '/api/payments/summary',
+    '/api/reports/sales',
+    '/api/reports/summary',
+    '/api/reports/revenue?period=day',
+    '/api/reports/by-product',
+    '/api/reports/by-customer',
+    '/api/reports/by-payment-status',
+    '/api/reports/export-csv',
+    '/api/search?q=cement',
+    '/invoice/{order_id}',
+]
+
+def residual_filter(statement, table):
+    """Whether a WHERE clause of the statement constrains the given table (alias)"""
+    return any(re.search(rf'\b{re.escape(table)}\.', clause)
+               for clause in re.split(r'\bWHERE\b', statement, flags=re.IGNORECASE)[1:])
+
+def plan_scans(conn, statement, parameters):
+    """Return {table: bounded} for the checked tables the plan reads without an index lookup.
+    
+    A scan counts as bounded only when the statement has a LIMIT, the scan
+    already returns rows in ORDER BY order (no sort step) and nothing filters
+    the scanned rows, so it stops after one page. A keyset page with any
+    other condition may walk the whole table before filling its LIMIT.
+    """
+    limited = re.search(r'\bLIMIT\b', statement, re.IGNORECASE) is not None
+    scans = {}
+    if conn.dialect.name == 'mysql':
+        result = conn.exec_driver_sql('EXPLAIN ' + statement, parameters)
+        for row in result.mappings():
+            # ALL reads every row; index walks a whole index
+            if row['type'] in ('ALL', 'index') and row['table']:
+                extra = row['Extra'] or ''
+                scans[row['table']] = (limited and row['type'] == 'index'
+                                       and 'Using where' not in extra and 'filesort' not in extra)
+    else:
+        details = [row[-1] for row in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+        sorted_after = any('TEMP B-TREE FOR ORDER BY' in detail for detail in details)
+        for detail in details:
+            match = re.match(r'SCAN (\w+)', detail)
+            if match:
+                name = match.group(1)
+                scans[name] = limited and not sorted_after and not residual_filter(statement, name)
+    # Statements alias repeated tables as orders_1, customers_2, ...
+    checked = {}
+    for name, bounded in scans.items():
+        table = re.sub(r'_\d+$', '', name)
+        if table in CHECKED_TABLES:
+            checked[table] = checked.get(table, True) and bounded
+    return checked
+
+def seed_orders(client, count):
+    for i in range(count):
+        response = client.post('/api/orders', json={
+            'customer_id': 1 + i % 3,
+            'order_date': (date.today() - timedelta(days=i % 40)).isoformat(),
+            'delivery_date': date.today().isoformat(),
+            'items': [{'product_id': 1 + i % 8, 'quantity': 1}],
+            'payment_status': ('Paid', 'Unpaid', 'Partial')[i % 3],
+            'payment_amount': 5,
+        })
+        if response.status_code != 200:
+            raise SystemExit(f"Seeding failed: {response.get_json()}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='admin123')
+    parser.add_argument('--seed', type=int, default=0, help='create this many orders before checking')
+    args = parser.parse_args()
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            captured.append((statement, parameters))
+
+    with app.app_context():
+        db.create_all()
+        apply_migrations(db.engine)
+        create_default_admin()
+        insert_sample_data()
+
+        client = app.test_client()
+        client.post('/login', data={'username': args.username, 'password': args.password})
+        if args.seed:
+            seed_orders(client, args.seed)
+
+        first_order = Order.query.order_by(Order.id).first()
+        values = {
+            'today': date.today().isoformat(),
+            'month_start': date.today().replace(day=1).isoformat(),
+            'order_id': first_order.id if first_order else None,
+            'customer_id': first_order.customer_id if first_order else None,
+        }
+
+        failures = 0
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            for route in ROUTES:
+                if '{order_id}' in route and first_order is None:
+                    print(f"SKIP  {route} (no orders)")
+                    continue
+                url = route.format(**values)
+                del captured[:]
+                response = client.get(url)
+                statements = list(captured)
+                del captured[:]
+                if response.status_code != 200:
+                    print(f"FAIL  {url} returned {response.status_code}")
+                    failures += 1
+                    continue
+
+                expected = EXPECTED_SCANS.get(route, set())
+                findings = []
+                with db.engine.connect() as conn:
+                    for statement, parameters in statements:
+                        scans = {table: bounded for table, bounded in plan_scans(conn, statement, parameters).items()
+                                 if table not in expected}
+                        for bounded in (True, False):
+                            tables = {table for table, b in scans.items() if b is bounded}
+                            if tables:
+                                findings.append((bounded, tables, statement))
+                unbounded = [f for f in findings if not f[0]]
+                failures += len(unbounded)
+                status = 'SCAN ' if unbounded else 'OK   '
+                print(f"{status} {url} ({len(statements)} queries)")
+                for bounded, tables, statement in findings:
+                    label = 'bounded' if bounded else 'full scan'
+                    print(f"      {label} of {', '.join(sorted(tables))}: {' '.join(statement.split())[:200]}")
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+    print(f"\n{failures} unexpected full scan(s)")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
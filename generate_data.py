@@ -0,0 +1,306 @@
+"""Synthetic data generator for capacity planning and benchmarks.
+
+Creates customers, products, orders, order items and payments with bulk
+inserts, committing every --batch-size orders. The same seed always produces
+the same rows (for the same end date), so benchmark runs are repeatable.
+
+Distributions can be tuned:
+    --items-per-order   weights for the number of lines in an order
+    --monthly-weights   twelve seasonality weights, January first
+    --payment-mix       share of paid, partial and unpaid orders
+
+Customers follow a long-tail popularity curve (a few contractors place most
+orders), Sundays are quiet, and partial orders carry one or two payments
+covering 10-90% of the total.
+
+Usage:
+    python generate_data.py --orders 100000
+    python generate_data.py --orders 2000000 --seed 7 --database-url sqlite:///big.db --reset
+
+Without --database-url the configured database is used. Rows are appended
+to existing data unless --reset is given, which drops and recreates every
+table. The same logic is available as generate_data(db, ...).
+"""
+import argparse
+import bisect
+import itertools
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+# Building materials with a price range in rupees and typical order quantities
+CATALOGUE = [
+    ('Portland Cement', 'bag', 330, 420, 10, 200),
+    ('White Cement', 'bag', 700, 950, 1, 20),
+    ('Red Bricks', 'piece', 8, 14, 500, 10000),
+    ('Fly Ash Bricks', 'piece', 6, 10, 500, 8000),
+    ('TMT Steel Bar', 'kg', 60, 78, 50, 2000),
+    ('Binding Wire', 'kg', 80, 110, 2, 50),
+    ('River Sand', 'cft', 45, 70, 50, 800),
+    ('M-Sand', 'cft', 35, 55, 50, 800),
+    ('Aggregate 20mm', 'cft', 38, 55, 50, 600),
+    ('Aggregate 10mm', 'cft', 40, 58, 50, 400),
+    ('PVC Pipe', 'piece', 150, 450, 2, 60),
+    ('CPVC Pipe', 'piece', 250, 650, 2, 40),
+    ('Wall Putty', 'bag', 650, 900, 2, 40),
+    ('Floor Tiles', 'sqft', 35, 120, 100, 2000),
+    ('Wall Tiles', 'sqft', 30, 90, 100, 1500),
+    ('Paint Primer', 'litre', 180, 320, 4, 80),
+    ('Waterproofing Compound', 'litre', 220, 480, 2, 40),
+    ('Plywood Sheet', 'piece', 900, 2400, 1, 40),
+]
+GRADES = ['', ' Premium', ' Standard', ' Economy', ' Grade A', ' Grade B']
+FIRST_NAMES = ['Ravi', 'Amit', 'Suresh', 'Imran', 'Priya', 'Anil', 'Farhan', 'Deepak', 'Neha', 'Vikram',
+               'Sunil', 'Arjun', 'Salman', 'Pooja', 'Rakesh', 'Zoya', 'Manoj', 'Kavita', 'Ajay', 'Nadeem']
+LAST_NAMES = ['Sharma', 'Kumar', 'Singh', 'Khan', 'Verma', 'Gupta', 'Patel', 'Yadav', 'Qureshi', 'Mehta']
+BUSINESSES = ['Constructions', 'Builders', 'Developers', 'Contractors', 'Infra', 'Traders']
+STREETS = ['MG Road', 'Station Road', 'Civil Lines', 'Model Colony', 'Gandhi Nagar', 'Ring Road',
+           'Nehru Marg', 'Sector 12', 'Old City', 'Industrial Area']
+CITIES = ['Lucknow', 'Kanpur', 'Jaipur', 'Bhopal', 'Indore', 'Agra', 'Meerut', 'Aligarh']
+PAYMENT_METHODS = ['Cash', 'UPI', 'Bank Transfer', 'Cheque']
+
+DEFAULT_ITEMS_PER_ORDER = {1: 35, 2: 28, 3: 18, 4: 10, 5: 6, 6: 3}
+# Building slows in the monsoon (July-September) and peaks after it
+DEFAULT_MONTHLY_WEIGHTS = [1.1, 1.1, 1.2, 1.0, 0.9, 0.8, 0.6, 0.55, 0.7, 1.1, 1.2, 1.15]
+DEFAULT_PAYMENT_MIX = {'paid': 0.6, 'partial': 0.25, 'unpaid': 0.15}
+WEEKDAY_WEIGHTS = [1.0, 1.0, 1.0, 1.0, 1.0, 1.1, 0.3]
+
+def money(paise):
+    return Decimal(paise).scaleb(-2)
+
+def customer_row(rng):
+    if rng.random() < 0.4:
+        name = f'{rng.choice(LAST_NAMES)} {rng.choice(BUSINESSES)}'
+    else:
+        name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+    return {
+        'name': name,
+        'phone': f'{rng.choice("6789")}{rng.randrange(10 ** 9):09d}',
+        'address': f'{rng.randint(1, 999)}, {rng.choice(STREETS)}, {rng.choice(CITIES)}'
+    }
+
+def product_rows(rng, count):
+    rows = []
+    for i in range(count):
+        name, unit, low, high, min_qty, max_qty = CATALOGUE[i % len(CATALOGUE)]
+        grade = GRADES[(i // len(CATALOGUE)) % len(GRADES)]
+        batch = i // (len(CATALOGUE) * len(GRADES))
+        rows.append({
+            'name': f'{name}{grade}' + (f' {batch + 1}' if batch else ''),
+            'price': money(rng.randint(low * 100, high * 100)),
+            'stock_quantity': rng.randint(max_qty * 5, max_qty * 50),
+            'unit': unit,
+            # Kept for generating quantities; not a column
+            'quantity_range': (min_qty, max_qty)
+        })
+    return rows
+
+def day_weights(start, end, monthly_weights):
+    """Cumulative weights for every day from start to end"""
+    days, cumulative, total = [], [], 0.0
+    day = start
+    while day <= end:
+        total += monthly_weights[day.month - 1] * WEEKDAY_WEIGHTS[day.weekday()]
+        days.append(day)
+        cumulative.append(total)
+        day += timedelta(days=1)
+    return days, cumulative
+
+def next_id(conn, table):
+    from sqlalchemy import func, select
+    return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+def generate_data(db, orders=10000, customers=None, products=None, seed=1, days=730, end_date=None,
+                  items_per_order=None, monthly_weights=None, payment_mix=None, batch_size=5000,
+                  progress=None):
+    """Insert synthetic rows into the database bound to db and return their counts.
+
+    Must be called inside an application context. customers and products
+    default to orders/20 (at least 20) and 120.
+    """
+    rng = random.Random(seed)
+    customers = customers or max(20, orders // 20)
+    products = products or 120
+    end_date = end_date or date.today()
+    items_per_order = items_per_order or DEFAULT_ITEMS_PER_ORDER
+    monthly_weights = monthly_weights or DEFAULT_MONTHLY_WEIGHTS
+    payment_mix = payment_mix or DEFAULT_PAYMENT_MIX
+    if len(monthly_weights) != 12:
+        raise ValueError('monthly_weights needs 12 values')
+
+    # Statement echo (on in development) would log every row of every batch
+    echo, db.engine.echo = db.engine.echo, False
+    try:
+        return insert_rows(db, rng, orders, customers, products, days, end_date,
+                           items_per_order, monthly_weights, payment_mix, batch_size, progress)
+    finally:
+        db.engine.echo = echo
+
+def insert_rows(db, rng, orders, customers, products, days, end_date, items_per_order,
+                monthly_weights, payment_mix, batch_size, progress):
+    """Bulk insert the rows for generate_data, committing once per batch"""
+    from sqlalchemy import insert
+    from app import Customer, Product, Order, OrderItem, Payment
+
+    tables = {model: model.__table__ for model in (Customer, Product, Order, OrderItem, Payment)}
+    conn = db.session.connection()
+    first_customer = next_id(conn, tables[Customer])
+    first_product = next_id(conn, tables[Product])
+    order_id = next_id(conn, tables[Order])
+    counts = {'customers': customers, 'products': products, 'orders': 0, 'order_items': 0, 'payments': 0}
+    started = time.perf_counter()
+
+    customer_batch = []
+    for i in range(customers):
+        customer_batch.append(dict(customer_row(rng), id=first_customer + i))
+        if len(customer_batch) == batch_size or i == customers - 1:
+            db.session.execute(insert(tables[Customer]), customer_batch)
+            customer_batch = []
+    catalogue = product_rows(rng, products)
+    db.session.execute(insert(tables[Product]), [
+        {key: value for key, value in dict(row, id=first_product + i).items() if key != 'quantity_range'}
+        for i, row in enumerate(catalogue)
+    ])
+    db.session.commit()
+
+    # Precomputed cumulative weights keep each draw to one bisect
+    popularity = list(itertools.accumulate(1 / (rank + 1) ** 0.8 for rank in range(customers)))
+    order_days, day_cumulative = day_weights(end_date - timedelta(days=days - 1), end_date, monthly_weights)
+    line_counts = list(items_per_order)
+    line_cumulative = list(itertools.accumulate(items_per_order[n] for n in line_counts))
+    statuses = ['Paid', 'Partial', 'Unpaid']
+    status_cumulative = list(itertools.accumulate(
+        [payment_mix.get('paid', 0), payment_mix.get('partial', 0), payment_mix.get('unpaid', 0)]))
+    prices = [int(row['price'] * 100) for row in catalogue]
+
+    def pick(cumulative):
+        return bisect.bisect(cumulative, rng.random() * cumulative[-1])
+
+    remaining = orders
+    while remaining:
+        order_rows, item_rows, payment_rows = [], [], []
+        for _ in range(min(batch_size, remaining)):
+            order_date = order_days[min(pick(day_cumulative), len(order_days) - 1)]
+            total = 0
+            for product_index in rng.sample(range(products), min(products, line_counts[pick(line_cumulative)])):
+                min_qty, max_qty = catalogue[product_index]['quantity_range']
+                # Log-uniform quantities: many small orders, a few truckloads
+                quantity = int(min_qty * (max_qty / min_qty) ** rng.random())
+                total += prices[product_index] * quantity
+                item_rows.append({'order_id': order_id, 'product_id': first_product + product_index,
+                                  'quantity': quantity, 'price': money(prices[product_index])})
+
+            status = statuses[pick(status_cumulative)]
+            paid = 0
+            if status == 'Paid':
+                installments = [total] if rng.random() < 0.8 else [total // 2, total - total // 2]
+            elif status == 'Partial':
+                first = int(total * rng.uniform(0.1, 0.9))
+                installments = [first] if rng.random() < 0.7 else [first // 2, first - first // 2]
+            else:
+                installments = []
+            for amount in installments:
+                paid += amount
+                payment_rows.append({
+                    'order_id': order_id,
+                    'payment_date': min(end_date, order_date + timedelta(days=rng.randint(0, 30))),
+                    'amount': money(amount),
+                    'payment_method': rng.choice(PAYMENT_METHODS)
+                })
+
+            delivered = order_date + timedelta(days=rng.randint(0, 7))
+            order_rows.append({
+                'id': order_id,
+                'customer_id': first_customer + min(pick(popularity), customers - 1),
+                'order_date': order_date,
+                'delivery_date': delivered,
+                'delivery_address': f'{rng.randint(1, 999)}, {rng.choice(STREETS)}, {rng.choice(CITIES)}',
+                'total_amount': money(total),
+                'payment_status': status,
+                'paid_amount': money(paid),
+                'balance_due': money(total - paid)
+            })
+            order_id += 1
+
+        db.session.execute(insert(tables[Order]), order_rows)
+        db.session.execute(insert(tables[OrderItem]), item_rows)
+        if payment_rows:
+            db.session.execute(insert(tables[Payment]), payment_rows)
+        db.session.commit()
+
+        remaining -= len(order_rows)
+        counts['orders'] += len(order_rows)
+        counts['order_items'] += len(item_rows)
+        counts['payments'] += len(payment_rows)
+        if progress:
+            progress(counts, time.perf_counter() - started)
+
+    counts['seconds'] = round(time.perf_counter() - started, 2)
+    return counts
+
+def parse_weights(text, keys=None):
+    """Parse 'key:weight,key:weight' into a dict"""
+    weights = {}
+    for part in text.split(','):
+        key, _, weight = part.partition(':')
+        key = key.strip()
+        weights[int(key) if keys is None else key] = float(weight)
+    if keys is not None and set(weights) - set(keys):
+        raise argparse.ArgumentTypeError(f"expected keys from {', '.join(keys)}")
+    return weights
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--orders', type=int, default=10000)
+    parser.add_argument('--customers', type=int, help='default: orders/20')
+    parser.add_argument('--products', type=int, help='default: 120')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--days', type=int, default=730, help='spread orders over this many days')
+    parser.add_argument('--end-date', type=lambda s: datetime.strptime(s, '%Y-%m-%d').date(),
+                        help='last order date, YYYY-MM-DD (default: today)')
+    parser.add_argument('--items-per-order', type=parse_weights, metavar='N:W,...',
+                        help='line count weights, e.g. 1:35,2:28,3:18,4:10,5:6,6:3')
+    parser.add_argument('--monthly-weights', type=lambda s: [float(w) for w in s.split(',')],
+                        metavar='W1,...,W12', help='seasonality weights, January first')
+    parser.add_argument('--payment-mix', type=lambda s: parse_weights(s, ['paid', 'partial', 'unpaid']),
+                        metavar='paid:W,partial:W,unpaid:W', help='e.g. paid:0.6,partial:0.25,unpaid:0.15')
+    parser.add_argument('--batch-size', type=int, default=5000, help='orders per insert batch and commit')
+    parser.add_argument('--database-url', help='database to fill (default: the configured one)')
+    parser.add_argument('--reset', action='store_true', help='drop and recreate all tables first')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+
+    # Imported after DATABASE_URL is set so the app binds to the target database
+    from app import app, db, create_default_admin
+    from migrations import apply_migrations
+
+    def report(counts, elapsed):
+        print(f"\r{counts['orders']:,} orders, {counts['order_items']:,} items, "
+              f"{counts['payments']:,} payments ({counts['orders'] / elapsed:,.0f} orders/s)",
+              end='', file=sys.stderr, flush=True)
+
+    with app.app_context():
+        if args.reset:
+            db.drop_all()
+        db.create_all()
+        apply_migrations(db.engine)
+        create_default_admin()
+        counts = generate_data(
+            db, orders=args.orders, customers=args.customers, products=args.products, seed=args.seed,
+            days=args.days, end_date=args.end_date, items_per_order=args.items_per_order,
+            monthly_weights=args.monthly_weights, payment_mix=args.payment_mix,
+            batch_size=args.batch_size, progress=report
+        )
+    print(file=sys.stderr)
+    print(f"✓ Generated {counts['customers']:,} customers, {counts['products']:,} products, "
+          f"{counts['orders']:,} orders, {counts['order_items']:,} items and "
+          f"{counts['payments']:,} payments in {counts['seconds']}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
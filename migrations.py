@@ -0,0 +1,153 @@
+"""Versioned schema migrations.
+
+db.create_all() only creates missing tables, so changes to existing tables
+are shipped as numbered migrations. Applied versions are recorded in the
+schema_migrations table and each migration runs once per database.
+
+Migrations must also be harmless on a database that db.create_all() built
+from the current models (which already has the change), so the helpers
+below skip indexes and columns that are already present. On MySQL the DDL
+is issued with ALGORITHM=INPLACE, LOCK=NONE so tables stay readable and
+writable while an index is built, and data backfills commit one id range
+at a time (update_in_batches) so no migration holds row locks on a whole
+table. A migration that stops part way is simply run again, so backfills
+must be safe to repeat.
+"""
+from datetime import datetime
+from sqlalchemy import inspect, text
+
+MIGRATIONS = []
+
+def migration(version, description):
+    """Register a migration function under a version number"""
+    def register(func):
+        MIGRATIONS.append((version, description, func))
+        return func
+    return register
+
+def has_index(conn, table, columns):
+    """True if an existing index (or primary key) starts with the given columns"""
+    inspector = inspect(conn)
+    existing = [ix['column_names'] for ix in inspector.get_indexes(table)]
+    existing.append(inspector.get_pk_constraint(table)['constrained_columns'])
+    return any(cols[:len(columns)] == list(columns) for cols in existing)
+
+def add_index(conn, table, name, columns):
+    """Create an index unless one covering the same leading columns exists"""
+    if has_index(conn, table, columns):
+        return False
+    column_list = ', '.join(columns)
+    if conn.dialect.name == 'mysql':
+        conn.execute(text(f'ALTER TABLE {table} ADD INDEX {name} ({column_list}), ALGORITHM=INPLACE, LOCK=NONE'))
+    else:
+        conn.execute(text(f'CREATE INDEX {name} ON {table} ({column_list})'))
+    return True
+
+def add_column(conn, table, name, definition):
+    """Add a column unless the table already has it"""
+    if name in {column['name'] for column in inspect(conn).get_columns(table)}:
+        return False
+    ddl = f'ALTER TABLE {table} ADD COLUMN {name} {definition}'
+    if conn.dialect.name == 'mysql':
+        ddl += ', ALGORITHM=INPLACE, LOCK=NONE'
+    conn.execute(text(ddl))
+    return True
+
+# Rows per backfill transaction
+BACKFILL_BATCH_SIZE = 1000
+
+def update_in_batches(conn, table, assignments, batch_size=BACKFILL_BATCH_SIZE):
+    """Run UPDATE table SET assignments over id ranges, committing after each"""
+    last_id = conn.execute(text(f'SELECT MAX(id) FROM {table}')).scalar() or 0
+    for start in range(0, last_id, batch_size):
+        conn.execute(text(f'UPDATE {table} SET {assignments} WHERE id > :start AND id <= :end'),
+                     {'start': start, 'end': start + batch_size})
+        conn.commit()
+
+def ensure_migrations_table(conn):
+    conn.execute(text(
+        'CREATE TABLE IF NOT EXISTS schema_migrations ('
+        'version INTEGER NOT NULL PRIMARY KEY, '
+        'description VARCHAR(255) NOT NULL, '
+        'applied_at DATETIME NOT NULL)'
+    ))
+
+def applied_versions(engine):
+    with engine.begin() as conn:
+        ensure_migrations_table(conn)
+        return {row[0] for row in conn.execute(text('SELECT version FROM schema_migrations'))}
+
+def apply_migrations(engine):
+    """Apply pending migrations in version order, returning the versions applied"""
+    done = applied_versions(engine)
+    applied = []
+    for version, description, func in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if version in done:
+            continue
+        # Migrations may commit part way (see update_in_batches); the version
+        # is recorded only once the whole migration has run
+        with engine.connect() as conn:
+            func(conn)
+            conn.execute(
+                text('INSERT INTO schema_migrations (version, description, applied_at) VALUES (:v, :d, :t)'),
+                {'v': version, 'd': description, 't': datetime.utcnow()}
+            )
+            conn.commit()
+        print(f"✓ Applied migration {version}: {description}")
+        applied.append(version)
+    return applied
+
+def migration_status(engine):
+    """List every known migration with whether it has been applied"""
+    done = applied_versions(engine)
+    return [{'version': version, 'description': description, 'applied': version in done}
+            for version, description, _ in sorted(MIGRATIONS, key=lambda m: m[0])]
+
+# Migrations
+# Keep the index names in sync with __table_args__ on the models in app.py.
+
+@migration(1, 'Secondary indexes for list filters, reports and search refresh')
+def add_secondary_indexes(conn):
+    indexes = [
+        ('customers', 'ix_customers_name', ['name', 'id']),
+        ('customers', 'ix_customers_updated_at', ['updated_at']),
+        ('products', 'ix_products_stock_quantity', ['stock_quantity']),
+        ('products', 'ix_products_updated_at', ['updated_at']),
+        ('orders', 'ix_orders_customer_id', ['customer_id', 'order_date']),
+        ('orders', 'ix_orders_order_date', ['order_date', 'id']),
+        ('orders', 'ix_orders_delivery_date', ['delivery_date']),
+        ('orders', 'ix_orders_status_date', ['payment_status', 'order_date']),
+        ('order_items', 'ix_order_items_order_id', ['order_id']),
+        ('order_items', 'ix_order_items_product_id', ['product_id']),
+        ('payments', 'ix_payments_order_id', ['order_id']),
+        ('payments', 'ix_payments_payment_date', ['payment_date']),
+    ]
+    for table, name, columns in indexes:
+        add_index(conn, table, name, columns)
+
+@migration(2, 'Denormalized paid_amount and balance_due on orders')
+def add_order_balances(conn):
+    add_column(conn, 'orders', 'paid_amount', 'DECIMAL(10,2) NOT NULL DEFAULT 0.00')
+    add_column(conn, 'orders', 'balance_due', 'DECIMAL(10,2) NOT NULL DEFAULT 0.00')
+    update_in_batches(conn, 'orders',
+        'balance_due = total_amount - COALESCE((SELECT SUM(amount) FROM payments WHERE payments.order_id = orders.id), 0), '
+        'paid_amount = COALESCE((SELECT SUM(amount) FROM payments WHERE payments.order_id = orders.id), 0)'
+    )
+    add_index(conn, 'orders', 'ix_orders_balance_due', ['balance_due', 'customer_id'])
+
+# Keep in sync with VERSIONED_TABLES in app.py
+VERSIONED_TABLES = ['customers', 'products', 'orders', 'order_items', 'payments']
+
+@migration(3, 'Table change counters for conditional GET')
+def add_table_versions(conn):
+    conn.execute(text(
+        'CREATE TABLE IF NOT EXISTS table_versions ('
+        'table_name VARCHAR(64) NOT NULL PRIMARY KEY, '
+        'version INTEGER NOT NULL DEFAULT 0, '
+        'changed_at DATETIME NOT NULL)'
+    ))
+    existing = {row[0] for row in conn.execute(text('SELECT table_name FROM table_versions'))}
+    for table in VERSIONED_TABLES:
+        if table not in existing:
+            conn.execute(text('INSERT INTO table_versions (table_name, version, changed_at) VALUES (:t, 0, :now)'),
+                         {'t': table, 'now': datetime.utcnow()})
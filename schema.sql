@@ -20,7 +20,9 @@ CREATE TABLE IF NOT EXISTS customers (
     phone VARCHAR(20) NOT NULL,
     address TEXT NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX ix_customers_name (name, id),
+    INDEX ix_customers_updated_at (updated_at)
 );
 
 -- Products table
@@ -31,7 +33,9 @@ CREATE TABLE IF NOT EXISTS products (
     stock_quantity INT NOT NULL DEFAULT 0,
     unit VARCHAR(20) DEFAULT 'piece',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX ix_products_stock_quantity (stock_quantity),
+    INDEX ix_products_updated_at (updated_at)
 );
 
 -- Orders table
@@ -43,8 +47,15 @@ CREATE TABLE IF NOT EXISTS orders (
     delivery_address TEXT,
     total_amount DECIMAL(10,2) NOT NULL DEFAULT 0.00,
     payment_status ENUM('Paid', 'Unpaid', 'Partial') DEFAULT 'Unpaid',
+    paid_amount DECIMAL(10,2) NOT NULL DEFAULT 0.00,
+    balance_due DECIMAL(10,2) NOT NULL DEFAULT 0.00,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX ix_orders_customer_id (customer_id, order_date),
+    INDEX ix_orders_order_date (order_date, id),
+    INDEX ix_orders_delivery_date (delivery_date),
+    INDEX ix_orders_status_date (payment_status, order_date),
+    INDEX ix_orders_balance_due (balance_due, customer_id),
     FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE CASCADE
 );
 
@@ -56,6 +67,8 @@ CREATE TABLE IF NOT EXISTS order_items (
     quantity INT NOT NULL,
     price DECIMAL(10,2) NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX ix_order_items_order_id (order_id),
+    INDEX ix_order_items_product_id (product_id),
     FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE,
     FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE CASCADE
 );
@@ -69,9 +82,37 @@ CREATE TABLE IF NOT EXISTS payments (
     payment_method VARCHAR(50) DEFAULT 'Cash',
     notes TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX ix_payments_order_id (order_id),
+    INDEX ix_payments_payment_date (payment_date),
     FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE
 );
 
+-- Change counters behind the ETags of /api/customers and /api/products
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name VARCHAR(64) NOT NULL PRIMARY KEY,
+    version INT NOT NULL DEFAULT 0,
+    changed_at DATETIME NOT NULL
+);
+
+INSERT INTO table_versions (table_name, version, changed_at) VALUES
+('customers', 0, NOW()),
+('products', 0, NOW()),
+('orders', 0, NOW()),
+('order_items', 0, NOW()),
+('payments', 0, NOW());
+
+-- Schema version tracking (see migrations.py); this schema already includes migrations 1-3
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT NOT NULL PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    applied_at DATETIME NOT NULL
+);
+
+INSERT INTO schema_migrations (version, description, applied_at) VALUES
+(1, 'Secondary indexes for list filters, reports and search refresh', NOW()),
+(2, 'Denormalized paid_amount and balance_due on orders', NOW()),
+(3, 'Table change counters for conditional GET', NOW());
+
 -- Insert default admin user (password: admin123)
 INSERT INTO users (username, password_hash) VALUES 
 ('admin', 'pbkdf2:sha256:600000$admin123$hash_placeholder');
@@ -25,6 +25,12 @@ REM Install requirements
 echo Installing requirements...
 pip install -r requirements.txt
 
+REM Download Bootstrap, jQuery and Font Awesome once (pages use the CDNs if this fails)
+if not exist "static\vendor" (
+    echo Downloading vendor libraries...
+    python assets.py --fetch-vendor
+)
+
 REM Start the application
 echo Starting application...
 echo.
@@ -0,0 +1,341 @@
+// Theme management
+class ThemeManager {
+    constructor() {
+        this.currentTheme = localStorage.getItem('theme') || 'light';
+        this.init();
+    }
+
+    init() {
+        this.applyTheme(this.currentTheme);
+        this.setupEventListeners();
+        this.updateUI();
+    }
+
+    applyTheme(theme) {
+        document.documentElement.setAttribute('data-theme', theme);
+        this.currentTheme = theme;
+        localStorage.setItem('theme', theme);
+    }
+
+    toggleTheme() {
+        const newTheme = this.currentTheme === 'light' ? 'dark' : 'light';
+        this.applyTheme(newTheme);
+        this.updateUI();
+    }
+
+    updateUI() {
+        const toggle = document.getElementById('themeToggle');
+        const label = document.getElementById('themeLabel');
+
+        if (toggle) {
+            toggle.checked = this.currentTheme === 'dark';
+        }
+
+        if (label) {
+            label.textContent = this.currentTheme === 'light' ? 'Light' : 'Dark';
+        }
+    }
+
+    setupEventListeners() {
+        const toggle = document.getElementById('themeToggle');
+        if (toggle) {
+            toggle.addEventListener('change', () => {
+                this.toggleTheme();
+            });
+        }
+    }
+}
+
+// Initialize theme manager
+const themeManager = new ThemeManager();
+
+// Language Manager
+class LanguageManager {
+    constructor() {
+        this.languageSelect = document.getElementById('languageSelect');
+        this.init();
+    }
+
+    init() {
+        if (this.languageSelect) {
+            // Add event listener
+            this.languageSelect.addEventListener('change', (e) => {
+                const newLanguage = e.target.value;
+                this.changeLanguage(newLanguage);
+            });
+        }
+    }
+
+    changeLanguage(language) {
+        $.ajax({
+            url: '/api/language',
+            method: 'POST',
+            contentType: 'application/json',
+            data: JSON.stringify({ language: language }),
+            success: (response) => {
+                if (response.success) {
+                    // Reload page to apply new language
+                    window.location.reload();
+                } else {
+                    showAlert('error', 'Failed to change language');
+                }
+            },
+            error: (xhr, status, error) => {
+                showAlert('error', 'Network error while changing language');
+            }
+        });
+    }
+}
+
+// Initialize language manager
+const languageManager = new LanguageManager();
+
+document.addEventListener('DOMContentLoaded', function() {
+    const mobileToggleBtn = document.getElementById('mobileToggleBtn');
+    const sidebar = document.getElementById('sidebar');
+    const sidebarOverlay = document.getElementById('sidebarOverlay');
+    const body = document.body;
+
+    // Toggle sidebar function
+    function toggleSidebar() {
+        const isVisible = sidebar.classList.contains('show');
+
+        if (isVisible) {
+            sidebar.classList.remove('show');
+            sidebarOverlay.classList.remove('show');
+            body.style.overflow = '';
+        } else {
+            sidebar.classList.add('show');
+            sidebarOverlay.classList.add('show');
+            body.style.overflow = 'hidden';
+        }
+
+        // Debug logging
+        console.log('Sidebar toggled:', {
+            isVisible: !isVisible,
+            hasShowClass: sidebar.classList.contains('show'),
+            transform: getComputedStyle(sidebar).transform,
+            width: window.innerWidth
+        });
+    }
+
+    // Toggle button click
+    mobileToggleBtn.addEventListener('click', function(e) {
+        e.preventDefault();
+        e.stopPropagation();
+        toggleSidebar();
+
+        // Change icon based on state
+        const icon = this.querySelector('i');
+        if (sidebar.classList.contains('show')) {
+            icon.className = 'fas fa-times';
+        } else {
+            icon.className = 'fas fa-bars';
+        }
+    });
+
+    // Close sidebar when clicking overlay
+    sidebarOverlay.addEventListener('click', function() {
+        toggleSidebar();
+        const icon = mobileToggleBtn.querySelector('i');
+        icon.className = 'fas fa-bars';
+    });
+
+    // Close sidebar when clicking on a nav link (mobile)
+    const navLinks = sidebar.querySelectorAll('.nav-link');
+    navLinks.forEach(link => {
+        link.addEventListener('click', function() {
+            if (window.innerWidth <= 991.98) {
+                toggleSidebar();
+                const icon = mobileToggleBtn.querySelector('i');
+                icon.className = 'fas fa-bars';
+            }
+        });
+    });
+
+    // Handle window resize
+    window.addEventListener('resize', function() {
+        if (window.innerWidth > 991.98) {
+            sidebar.classList.remove('show');
+            sidebarOverlay.classList.remove('show');
+            body.style.overflow = '';
+            const icon = mobileToggleBtn.querySelector('i');
+            icon.className = 'fas fa-bars';
+        }
+    });
+
+    // Close sidebar on escape key
+    document.addEventListener('keydown', function(e) {
+        if (e.key === 'Escape' && sidebar.classList.contains('show')) {
+            toggleSidebar();
+            const icon = mobileToggleBtn.querySelector('i');
+            icon.className = 'fas fa-bars';
+        }
+    });
+
+    // Debug: Log initial state
+    console.log('Sidebar initialized:', {
+        width: window.innerWidth,
+        isMobile: window.innerWidth <= 991.98,
+        toggleButtonVisible: getComputedStyle(mobileToggleBtn).display !== 'none',
+        sidebarTransform: getComputedStyle(sidebar).transform
+    });
+});
+
+function showAlert(message, type = 'info') {
+    const alertContainer = document.getElementById('alertContainer');
+
+    // Create alert element
+    const alertDiv = document.createElement('div');
+    alertDiv.className = `alert alert-${type} alert-dismissible fade show`;
+    alertDiv.innerHTML = `
+        ${message}
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+
+    // Add to container
+    alertContainer.appendChild(alertDiv);
+
+    // Auto-remove after 5 seconds
+    setTimeout(() => {
+        if (alertDiv.parentNode) {
+            alertDiv.classList.remove('show');
+            setTimeout(() => {
+                if (alertDiv.parentNode) {
+                    alertDiv.parentNode.removeChild(alertDiv);
+                }
+            }, 150);
+        }
+    }, 5000);
+
+    // Handle manual close
+    alertDiv.querySelector('.btn-close').addEventListener('click', () => {
+        alertDiv.classList.remove('show');
+        setTimeout(() => {
+            if (alertDiv.parentNode) {
+                alertDiv.parentNode.removeChild(alertDiv);
+            }
+        }, 150);
+    });
+}
+
+// Global error handler for AJAX requests
+$(document).ajaxError(function(event, xhr, settings, error) {
+    console.error('AJAX Error:', {
+        url: settings.url,
+        method: settings.method,
+        status: xhr.status,
+        statusText: xhr.statusText,
+        responseText: xhr.responseText,
+        error: error
+    });
+
+    // Reset delete buttons on any AJAX error to prevent stuck states
+    if (settings.method === 'DELETE') {
+        window.resetDeleteButtons();
+    }
+
+    // Show user-friendly error message for unexpected errors
+    if (xhr.status >= 500) {
+        showAlert('A server error occurred. Please try again later.', 'danger');
+    } else if (xhr.status === 0) {
+        showAlert('Network error. Please check your connection and try again.', 'danger');
+    }
+});
+
+// Global error handler for JavaScript errors
+window.addEventListener('error', function(event) {
+    console.error('JavaScript Error:', {
+        message: event.message,
+        filename: event.filename,
+        lineno: event.lineno,
+        colno: event.colno,
+        error: event.error
+    });
+
+    // Show user-friendly error message
+    showAlert('An unexpected error occurred. Please refresh the page and try again.', 'danger');
+});
+
+// Global function to reset all delete button states
+window.resetDeleteButtons = function() {
+    // Reset customer delete button
+    const customerBtn = $('#confirmDeleteCustomerBtn');
+    if (customerBtn.length) {
+        customerBtn.prop('disabled', false);
+        customerBtn.html('<i class="fas fa-trash me-2"></i>Delete Customer');
+    }
+
+    // Reset product delete button
+    const productBtn = $('#confirmDeleteProductBtn');
+    if (productBtn.length) {
+        productBtn.prop('disabled', false);
+        productBtn.html('<i class="fas fa-trash me-2"></i>Delete Product');
+    }
+
+    // Reset order delete button
+    const orderBtn = $('#confirmDeleteOrderBtn');
+    if (orderBtn.length) {
+        orderBtn.prop('disabled', false);
+        orderBtn.html('<i class="fas fa-trash me-2"></i>Delete Order');
+    }
+};
+
+// Reset delete buttons when page becomes visible (user switches tabs)
+document.addEventListener('visibilitychange', function() {
+    if (!document.hidden) {
+        window.resetDeleteButtons();
+    }
+});
+
+// Reset delete buttons when window gains focus
+window.addEventListener('focus', function() {
+    window.resetDeleteButtons();
+});
+
+// Safety mechanism: Auto-reset delete buttons if they remain disabled for too long
+setInterval(function() {
+    const disabledButtons = $('button:disabled').filter(function() {
+        return $(this).html().includes('fa-spinner fa-spin');
+    });
+
+    if (disabledButtons.length > 0) {
+        console.warn('Found stuck delete buttons, resetting...');
+        window.resetDeleteButtons();
+    }
+}, 10000); // Check every 10 seconds
+
+// Debug function to check button states (for troubleshooting)
+window.debugButtonStates = function() {
+    console.log('=== Button State Debug ===');
+
+    const customerBtn = $('#confirmDeleteCustomerBtn');
+    const productBtn = $('#confirmDeleteProductBtn');
+    const orderBtn = $('#confirmDeleteOrderBtn');
+
+    if (customerBtn.length) {
+        console.log('Customer Delete Button:', {
+            disabled: customerBtn.prop('disabled'),
+            html: customerBtn.html(),
+            visible: customerBtn.is(':visible')
+        });
+    }
+
+    if (productBtn.length) {
+        console.log('Product Delete Button:', {
+            disabled: productBtn.prop('disabled'),
+            html: productBtn.html(),
+            visible: productBtn.is(':visible')
+        });
+    }
+
+    if (orderBtn.length) {
+        console.log('Order Delete Button:', {
+            disabled: orderBtn.prop('disabled'),
+            html: orderBtn.html(),
+            visible: orderBtn.is(':visible')
+        });
+    }
+
+    console.log('=== End Debug ===');
+};
@@ -0,0 +1,53 @@
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+# The app reads its configuration at import time
+os.environ['FLASK_ENV'] = 'testing'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app as flask_app, db, create_default_admin, customer_search_index, product_search_index, user_cache
+from generate_data import generate_data
+from migrations import apply_migrations
+
+# Generated orders are spread over this many days so every report and
+# dashboard range used by the tests has rows in it
+DATA_DAYS = 60
+
+@pytest.fixture
+def app():
+    return flask_app
+
+@pytest.fixture
+def seed_database(app):
+    """Return a function that recreates the database holding the given number of orders"""
+    def seed(orders, **kwargs):
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            apply_migrations(db.engine)
+            customer_search_index.reset()
+            product_search_index.reset()
+            user_cache.clear()
+            create_default_admin()
+            kwargs.setdefault('days', DATA_DAYS)
+            kwargs.setdefault('end_date', date.today() + timedelta(days=1))
+            generate_data(db, orders=orders, seed=1, **kwargs)
+    return seed
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    yield client
+    with app.app_context():
+        db.session.remove()
+
+@pytest.fixture
+def login(client):
+    """Return a function that signs the test client in as the default admin"""
+    def login():
+        response = client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+        assert response.status_code in (200, 302)
+    return login
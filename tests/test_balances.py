@@ -0,0 +1,56 @@
+"""Stored paid_amount and balance_due follow payments and order totals."""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app import db, Customer, Order, Payment, repair_order_balances
+
+@pytest.fixture
+def order(app, seed_database):
+    seed_database(0)
+    with app.app_context():
+        customer = Customer(name='Balance Test', phone='9000000100', address='Test Road')
+        db.session.add(customer)
+        db.session.flush()
+        order = Order(customer_id=customer.id, order_date=date.today(), total_amount=Decimal('100.00'))
+        db.session.add(order)
+        db.session.commit()
+        yield order.id
+        db.session.remove()
+
+def stored_balance(order_id):
+    """(paid_amount, balance_due, total minus payments) as read back from the database"""
+    db.session.expire_all()
+    order = db.session.get(Order, order_id)
+    paid = sum((p.amount for p in Payment.query.filter_by(order_id=order_id)), Decimal('0'))
+    return order.paid_amount, order.balance_due, order.total_amount - paid
+
+def test_payment_insert_and_delete(order):
+    first = Payment(order_id=order, payment_date=date.today(), amount=Decimal('30.00'))
+    db.session.add_all([first, Payment(order_id=order, payment_date=date.today(), amount=Decimal('25.50'))])
+    db.session.commit()
+    assert stored_balance(order) == (Decimal('55.50'), Decimal('44.50'), Decimal('44.50'))
+
+    db.session.delete(db.session.get(Payment, first.id))
+    db.session.commit()
+    assert stored_balance(order) == (Decimal('25.50'), Decimal('74.50'), Decimal('74.50'))
+
+def test_order_total_change(order):
+    db.session.add(Payment(order_id=order, payment_date=date.today(), amount=Decimal('40.00')))
+    db.session.commit()
+
+    db.session.get(Order, order).total_amount = Decimal('150.00')
+    db.session.commit()
+    assert stored_balance(order) == (Decimal('40.00'), Decimal('110.00'), Decimal('110.00'))
+
+def test_repair_restores_drifted_balances(order):
+    db.session.add(Payment(order_id=order, payment_date=date.today(), amount=Decimal('60.00')))
+    db.session.commit()
+    # Bypass the flush hooks, as a manual SQL fix or an old writer would
+    db.session.execute(Order.__table__.update().values(paid_amount=0, balance_due=999))
+    db.session.commit()
+
+    assert repair_order_balances() == 1
+    assert stored_balance(order) == (Decimal('60.00'), Decimal('40.00'), Decimal('40.00'))
+    assert repair_order_balances() == 0
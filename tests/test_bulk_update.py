@@ -0,0 +1,61 @@
+"""Bulk product updates: dry runs and price rule selectors."""
+from decimal import Decimal
+
+import pytest
+
+from app import db, Product
+
+@pytest.fixture
+def products(app, seed_database, login):
+    seed_database(0)
+    with app.app_context():
+        db.session.add_all([
+            Product(name='Zeta Tile Glossy', price=Decimal('40.00'), stock_quantity=50, unit='box'),
+            Product(name='Zeta Tile Matte', price=Decimal('30.00'), stock_quantity=20, unit='sqft'),
+            Product(name='Zeta Grout', price=Decimal('10.00'), stock_quantity=5, unit='box'),
+        ])
+        db.session.commit()
+    login()
+
+def snapshot(app):
+    with app.app_context():
+        return {p.id: (p.name, p.unit, p.price, p.stock_quantity) for p in Product.query}
+
+def changed(before, after):
+    return {before[pid][0] for pid in before if before[pid] != after[pid]}
+
+def test_dry_run_changes_nothing(app, client, products):
+    before = snapshot(app)
+    response = client.post('/api/products/bulk-update', json={
+        'dry_run': True,
+        'price_rules': [{'unit': 'box', 'percent': 10}],
+        'stock': [{'product_id': pid, 'adjustment': 3} for pid in list(before)[:2]]
+    })
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['dry_run'] is True
+    assert result['affected'] > 0
+    assert snapshot(app) == before
+
+def test_name_pattern_updates_only_matching_rows(app, client, products):
+    before = snapshot(app)
+    response = client.post('/api/products/bulk-update', json={
+        'price_rules': [{'name_pattern': 'zeta tile*', 'amount': 5}]
+    })
+    assert response.status_code == 200
+    after = snapshot(app)
+    assert changed(before, after) == {'Zeta Tile Glossy', 'Zeta Tile Matte'}
+    assert response.get_json()['affected'] == 2
+    assert sorted(row[2] for row in after.values() if row[0].startswith('Zeta Tile')) == [Decimal('35.00'), Decimal('45.00')]
+
+def test_unit_updates_only_matching_rows(app, client, products):
+    before = snapshot(app)
+    expected = {name for name, unit, _, _ in before.values() if unit == 'sqft'}
+    response = client.post('/api/products/bulk-update', json={
+        'price_rules': [{'unit': 'sqft', 'set_price': '12.50'}]
+    })
+    assert response.status_code == 200
+    after = snapshot(app)
+    assert 'Zeta Tile Matte' in expected
+    assert changed(before, after) == expected
+    assert all(row[2] == Decimal('12.50') for row in after.values() if row[1] == 'sqft')
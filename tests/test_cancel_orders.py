@@ -0,0 +1,31 @@
+"""Cancelling orders restocks their items and drops their cached invoices."""
+import os
+
+import app as shop
+from app import db, InvoiceCache, Order, Product
+
+def test_cancel_drops_cached_invoice_and_restores_stock(app, client, seed_database, login, tmp_path, monkeypatch):
+    monkeypatch.setattr(shop, 'invoice_cache', InvoiceCache(str(tmp_path), memory_bytes=1 << 20, disk_bytes=1 << 20))
+    seed_database(20)
+    with app.app_context():
+        order = Order.query.filter(Order.items.any()).order_by(Order.id).first()
+        order_id = order.id
+        quantities = {}
+        for item in order.items:
+            quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+        stock_before = {pid: db.session.get(Product, pid).stock_quantity for pid in quantities}
+    login()
+
+    assert client.get(f'/invoice/{order_id}').status_code == 200
+    assert [name for name in os.listdir(tmp_path) if name.startswith(f'{order_id}-')]
+
+    response = client.post('/api/orders/cancel', json={'order_ids': [order_id]})
+    assert response.status_code == 200
+
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(f'{order_id}-')]
+    with app.app_context():
+        db.session.remove()
+        assert db.session.get(Order, order_id) is None
+        assert {pid: db.session.get(Product, pid).stock_quantity for pid in quantities} == {
+            pid: stock_before[pid] + quantity for pid, quantity in quantities.items()
+        }
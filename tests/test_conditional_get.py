@@ -0,0 +1,33 @@
+"""ETags of versioned lists follow the table_versions change counters."""
+from app import db, Customer, TableVersion
+
+def version(app, table):
+    with app.app_context():
+        db.session.remove()
+        return db.session.get(TableVersion, table).version
+
+def test_etag_round_trip(app, client, seed_database, login):
+    seed_database(10)
+    login()
+
+    first = client.get('/api/products')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert client.get('/api/products', headers={'If-None-Match': etag}).status_code == 304
+
+    # A write to another table leaves the product list's ETag alone
+    with app.app_context():
+        db.session.add(Customer(name='Version Test', phone='9000000200', address='Test Road'))
+        db.session.commit()
+    assert client.get('/api/products', headers={'If-None-Match': etag}).status_code == 304
+
+    # A product write bumps its counter when the transaction commits
+    products_before = version(app, 'products')
+    product_id = first.get_json()[0]['id']
+    assert client.put(f'/api/products/{product_id}', json={'stock_quantity': 123}).status_code == 200
+    assert version(app, 'products') == products_before + 1
+
+    changed = client.get('/api/products', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert client.get('/api/products', headers={'If-None-Match': changed.headers['ETag']}).status_code == 304
@@ -0,0 +1,44 @@
+"""Bulk order import with a mix of valid and invalid rows."""
+import json
+
+from app import db, Customer, Order, Product
+
+def test_import_keeps_valid_rows_and_reports_the_rest(app, client, seed_database, login):
+    seed_database(20)
+    with app.app_context():
+        customer_id = db.session.query(Customer.id).order_by(Customer.id).first()[0]
+        products = Product.query.filter(Product.stock_quantity >= 10).order_by(Product.id).limit(2).all()
+        (first, first_stock), (second, second_stock) = [(p.id, p.stock_quantity) for p in products]
+        last_order_id = db.session.query(db.func.max(Order.id)).scalar()
+    login()
+
+    lines = [
+        {'order_ref': 'A', 'customer_id': customer_id, 'order_date': '2024-05-01',
+         'payment_status': 'Partial', 'payment_amount': '1.00',
+         'items': [{'product_id': first, 'quantity': 2}]},
+        {'order_ref': 'B', 'customer_id': customer_id, 'order_date': '2024-05-01', 'items': 5},
+        {'order_ref': 'C', 'customer_id': 999999, 'order_date': '2024-05-01',
+         'items': [{'product_id': first, 'quantity': 1}]},
+        {'order_ref': 'D', 'customer_id': customer_id, 'order_date': '2024-05-02',
+         'items': [{'product_id': second, 'quantity': second_stock + 1}]},
+        {'order_ref': 'E', 'customer_id': customer_id, 'order_date': '2024-05-03',
+         'items': [{'product_id': first, 'quantity': 1}, {'product_id': second, 'quantity': 3}]},
+    ]
+    body = '\n'.join(json.dumps(line) for line in lines) + '\n{not json\n'
+    response = client.post('/api/orders/import?format=jsonl', data=body, content_type='application/x-ndjson')
+
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['imported'] == 2
+    assert [(e['row'], e['order_ref']) for e in result['errors']] == [(2, 'B'), (3, 'C'), (4, 'D'), (6, None)]
+    assert all(order_id > last_order_id for order_id in result['order_ids'])
+
+    with app.app_context():
+        imported = [db.session.get(Order, order_id) for order_id in result['order_ids']]
+        assert [str(o.order_date) for o in imported] == ['2024-05-01', '2024-05-03']
+        assert [sorted((i.product_id, i.quantity) for i in o.items) for o in imported] == [
+            [(first, 2)], sorted([(first, 1), (second, 3)])
+        ]
+        assert imported[0].paid_amount == 1 and imported[0].balance_due == imported[0].total_amount - 1
+        assert db.session.get(Product, first).stock_quantity == first_stock - 3
+        assert db.session.get(Product, second).stock_quantity == second_stock - 3
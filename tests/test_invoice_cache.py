@@ -0,0 +1,34 @@
+"""Disk level of the invoice PDF cache."""
+import os
+
+from app import InvoiceCache
+
+def pdf_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith('.pdf'))
+
+def test_disk_budget_evicts_least_recently_used(tmp_path):
+    cache = InvoiceCache(str(tmp_path), memory_bytes=0, disk_bytes=250)
+    for order_id in range(1, 4):
+        cache.put(order_id, 'v1', b'x' * 100)
+    
+    assert pdf_files(tmp_path) == ['2-v1.pdf', '3-v1.pdf']
+    assert cache.get(1, 'v1') is None
+    assert cache.get(3, 'v1') == b'x' * 100
+
+def test_new_version_and_invalidate_remove_old_files(tmp_path):
+    cache = InvoiceCache(str(tmp_path), memory_bytes=1000, disk_bytes=1000)
+    cache.put(1, 'v1', b'old')
+    cache.put(1, 'v2', b'new')
+    assert pdf_files(tmp_path) == ['1-v2.pdf']
+    
+    cache.invalidate(1)
+    assert pdf_files(tmp_path) == []
+    assert cache.get(1, 'v2') is None
+
+def test_index_is_rebuilt_from_existing_files(tmp_path):
+    InvoiceCache(str(tmp_path), memory_bytes=0, disk_bytes=1000).put(7, 'v1', b'x' * 100)
+    
+    restarted = InvoiceCache(str(tmp_path), memory_bytes=0, disk_bytes=1000)
+    assert restarted.get(7, 'v1') == b'x' * 100
+    restarted.invalidate(7)
+    assert pdf_files(tmp_path) == []
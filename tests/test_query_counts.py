@@ -0,0 +1,73 @@
+"""List, dashboard and report endpoints must not issue a query per row."""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from conftest import DATA_DAYS
+
+START = (date.today() - timedelta(days=DATA_DAYS)).isoformat()
+END = (date.today() + timedelta(days=1)).isoformat()
+
+# Every endpoint below needs at most this many statements, whatever the data size
+MAX_STATEMENTS = 3
+
+ENDPOINTS = [
+    # Lists
+    '/api/orders',
+    '/api/orders?outstanding=1',
+    '/api/payments',
+    '/api/customers',
+    '/api/products',
+    '/api/search?q=sharma&type=orders',
+    # Dashboard
+    '/api/dashboard/summary',
+    '/api/dashboard/pending-deliveries',
+    # Reports
+    f'/api/reports/sales?start_date={START}&end_date={END}',
+    f'/api/reports/summary?start_date={START}&end_date={END}',
+    f'/api/reports/revenue?start_date={START}&end_date={END}',
+    f'/api/reports/by-product?start_date={START}&end_date={END}',
+    f'/api/reports/by-customer?start_date={START}&end_date={END}',
+    f'/api/reports/by-payment-status?start_date={START}&end_date={END}',
+    f'/api/reports/export-csv?start_date={START}&end_date={END}',
+]
+
+def statement_counts(app, client):
+    """Statements executed by one request to each endpoint, after a warm-up request"""
+    with app.app_context():
+        engine = db.engine
+    
+    statements = []
+    
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    counts = {}
+    for url in ENDPOINTS:
+        client.get(url).get_data()
+        event.listen(engine, 'before_cursor_execute', count_statement)
+        try:
+            response = client.get(url)
+            # Reading the body runs streamed responses (the CSV export) to the end
+            response.get_data()
+        finally:
+            event.remove(engine, 'before_cursor_execute', count_statement)
+        assert response.status_code == 200, url
+        counts[url] = len(statements)
+        statements.clear()
+    return counts
+
+@pytest.mark.parametrize('orders', [150])
+def test_query_count_does_not_grow_with_data(app, client, seed_database, login, orders):
+    seed_database(orders)
+    login()
+    small = statement_counts(app, client)
+    
+    seed_database(orders * 2)
+    login()
+    large = statement_counts(app, client)
+    
+    assert large == small
+    assert max(large.values()) <= MAX_STATEMENTS, large
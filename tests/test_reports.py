@@ -0,0 +1,60 @@
+"""Sales report paging, summary totals and grouped report labels."""
+import csv
+import io
+from datetime import date, timedelta
+from decimal import Decimal
+
+from conftest import DATA_DAYS
+
+START = (date.today() - timedelta(days=DATA_DAYS)).isoformat()
+END = (date.today() + timedelta(days=1)).isoformat()
+
+def test_sales_pages_cover_the_export_in_order(client, seed_database, login):
+    seed_database(150)
+    login()
+
+    seen = []
+    cursor = None
+    while True:
+        response = client.get('/api/reports/sales', query_string={
+            'start_date': START, 'end_date': END, 'limit': 40, 'cursor': cursor or ''
+        })
+        assert response.status_code == 200
+        data = response.get_json()
+        seen.extend((line['date'], line['order_id'], line['product']) for line in data['items'])
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+
+    response = client.get('/api/reports/export-csv', query_string={'start_date': START, 'end_date': END})
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))[1:]
+    assert [(int(row[0]), row[3]) for row in rows] == [(order_id, product) for _, order_id, product in seen]
+    assert [row[1] for row in rows] == sorted(row[1] for row in rows)
+
+def test_sales_rejects_bad_cursor(client, seed_database, login):
+    seed_database(10)
+    login()
+    assert client.get('/api/reports/sales?cursor=bm9wZQ').status_code == 400
+
+def test_week_labels_are_iso_weeks(client, seed_database, login):
+    # 2020-12-28 to 2021-01-10 spans ISO weeks 2020-W53 and 2021-W01
+    seed_database(60, days=14, end_date=date(2021, 1, 10))
+    login()
+    response = client.get('/api/reports/revenue', query_string={
+        'start_date': '2020-12-28', 'end_date': '2021-01-10', 'period': 'week'
+    })
+    assert response.status_code == 200
+    assert [row['period'] for row in response.get_json()] == ['2020-W53', '2021-W01']
+
+def test_summary_keeps_exact_money(client, seed_database, login):
+    seed_database(40)
+    login()
+    query = {'start_date': START, 'end_date': END}
+    exact = client.get('/api/reports/summary', query_string=dict(query, money_format='string')).get_json()
+    number = client.get('/api/reports/summary', query_string=query).get_json()
+
+    lines = client.get('/api/reports/sales', query_string=dict(query, limit=1000, money_format='string')).get_json()
+    total = sum(Decimal(line['total']) for line in lines['items'])
+    assert Decimal(exact['total_sales']) == total
+    assert Decimal(exact['average_order_value']) == (total / exact['total_orders']).quantize(Decimal('0.01'))
+    assert number['total_sales'] == float(total)
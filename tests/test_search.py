@@ -0,0 +1,54 @@
+"""Trigram search over customers and products."""
+from datetime import date, timedelta
+
+import pytest
+
+from app import db, Customer, Order
+
+@pytest.fixture
+def customers(app, seed_database, login):
+    seed_database(200)
+    with app.app_context():
+        db.session.add_all([
+            Customer(name='ABC Construction', phone='0123456789', address='12, Station Road, Kanpur'),
+            Customer(name='Pooja Mehta', phone='9876503456', address='4, Civil Lines, Agra'),
+        ])
+        db.session.commit()
+    login()
+
+def names(client, query, search_type='customers'):
+    response = client.get('/api/search', query_string={'q': query, 'type': search_type})
+    assert response.status_code == 200
+    return [row['name'] for row in response.get_json()]
+
+def test_phone_substring_finds_exact_matches(client, customers):
+    # 3456 sits mid-number in both phones, scoring below the similarity cut
+    assert set(names(client, '3456')[:2]) == {'ABC Construction', 'Pooja Mehta'}
+    assert names(client, '01234')[0] == 'ABC Construction'
+
+def test_partial_word_finds_exact_matches(client, customers):
+    assert names(client, 'struct')[0] == 'ABC Construction'
+    assert names(client, 'nstr')[0] == 'ABC Construction'
+    assert names(client, 'abc cons')[0] == 'ABC Construction'
+
+def test_whole_words_rank_first(client, customers):
+    assert names(client, 'pooja mehta')[0] == 'Pooja Mehta'
+    assert names(client, 'cement', 'products')[0].lower().endswith('cement')
+
+def test_best_customer_orders_come_first_even_when_old(app, client, customers):
+    with app.app_context():
+        best = Customer(name='Zubin Kothari', phone='9000000001', address='Old Town')
+        other = Customer(name='Zubin Kothari Traders', phone='9000000002', address='New Town')
+        db.session.add_all([best, other])
+        db.session.flush()
+        old = date.today() - timedelta(days=800)
+        db.session.add_all([Order(customer_id=best.id, order_date=old, total_amount=10) for _ in range(2)])
+        db.session.add_all([Order(customer_id=other.id, order_date=date.today(), total_amount=10) for _ in range(10)])
+        db.session.commit()
+    
+    response = client.get('/api/search', query_string={'q': 'zubin kothari', 'type': 'orders', 'limit': 5})
+    assert response.status_code == 200
+    rows = response.get_json()
+    assert len(rows) == 5
+    assert [row['customer_name'] for row in rows[:2]] == ['Zubin Kothari'] * 2
+    assert {row['customer_name'] for row in rows[2:]} == {'Zubin Kothari Traders'}